@@ -0,0 +1,93 @@
+import atexit
+import os
+import threading
+import time
+
+from core import fast_json
+
+# SkillManager re-executes skill files on every load, so anything a skill
+# creates at module level (threads, pools, exit hooks) would pile up per
+# load. This module is imported normally and runs once per process.
+
+_lock = threading.Lock()
+_exit_hooks = {}
+
+# Debounced JSON writes: path -> (obj, indent); one writer thread for all
+_pending = {}
+_pending_cond = threading.Condition()
+_write_lock = threading.Lock()  # writer thread vs. exit flush
+_writer = None
+_WRITE_DELAY = 1.0  # seconds; lets a burst of saves collapse into one write
+_MAX_RETRY_DELAY = 60.0
+
+
+def on_exit(key, fn):
+    """Run fn at interpreter exit; one hook per key, the latest registration wins."""
+    with _lock:
+        _exit_hooks[key] = fn
+
+
+def schedule_write(path, obj, indent=False):
+    """Write obj as JSON to path shortly; saves to the same path coalesce.
+
+    The latest obj for a path wins, so callers should pass a snapshot.
+    """
+    global _writer
+    with _pending_cond:
+        _pending[path] = (obj, indent)
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="json-writer", daemon=True)
+            _writer.start()
+        _pending_cond.notify()
+
+
+def flush_writes():
+    """Write everything pending now (atomically, via a temp file).
+
+    A failed write goes back to pending (unless a newer one already
+    arrived), so the next flush or the exit flush retries it. Returns
+    the number of failed writes.
+    """
+    failed = 0
+    with _write_lock:
+        with _pending_cond:
+            batch = list(_pending.items())
+            _pending.clear()
+        for path, entry in batch:
+            obj, indent = entry
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                fast_json.dump_file_atomic(path, obj, indent=indent)
+            except Exception as e:
+                print(f"⚠️ [WRITER]: Could not save {path}: {e}")
+                failed += 1
+                with _pending_cond:
+                    _pending.setdefault(path, entry)
+    return failed
+
+
+def _write_loop():
+    delay = _WRITE_DELAY
+    while True:
+        with _pending_cond:
+            while not _pending:
+                _pending_cond.wait()
+        time.sleep(delay)  # let a burst pile up
+        # Back off while writes keep failing (e.g. a read-only directory)
+        delay = min(delay * 2, _MAX_RETRY_DELAY) if flush_writes() else _WRITE_DELAY
+
+
+def _run_exit_hooks():
+    with _lock:
+        hooks = list(_exit_hooks.items())
+    for key, fn in hooks:
+        try:
+            fn()
+        except Exception as e:
+            print(f"⚠️ [EXIT]: {key} failed: {e}")
+    flush_writes()
+
+
+atexit.register(_run_exit_hooks)
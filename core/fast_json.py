@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import threading
+
+# orjson is optional: same API either way, bytes in/out
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (2-space indent if requested)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def load_file(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+# path -> ((st_mtime_ns, st_size), parsed); module state, so it survives
+# skill reloads (SkillManager re-executes skill files, not core modules)
+_parse_cache = {}
+_parse_lock = threading.Lock()
+
+
+def load_file_cached(path):
+    """load_file, reusing the last parse while the file's mtime and size are unchanged.
+
+    The result is shared between callers: copy whatever you intend to mutate.
+    """
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _parse_lock:
+        cached = _parse_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    parsed = load_file(path)
+    with _parse_lock:
+        _parse_cache[path] = (stamp, parsed)
+    return parsed
+
+
+def dump_file(path, obj, indent: bool = False):
+    with open(path, "wb") as f:
+        f.write(dumps(obj, indent=indent))
+
+
+def write_atomic(path, data: bytes):
+    """Write bytes via a sibling temp file + os.replace, so readers never see half a file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def dump_file_atomic(path, obj, indent: bool = False):
+    """dump_file, atomically (see write_atomic)."""
+    write_atomic(path, dumps(obj, indent=indent))
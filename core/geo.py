@@ -0,0 +1,26 @@
+import threading
+import time
+
+import requests
+
+from core import fast_json
+
+# Time and Weather both geolocate by IP at startup; share one lookup
+_GEO_URL = "https://ipapi.co/json/"
+_cache = {"t": 0.0, "data": None}
+_lock = threading.Lock()
+_session = requests.Session()  # keep-alive across refreshes
+_session.headers.update({"User-Agent": "crystal/1.0"})
+
+
+def get_geo(ttl: float = 600, timeout: float = 5) -> dict:
+    """ipapi.co JSON for this machine, reused for `ttl` seconds.
+
+    Raises like requests does when the lookup fails; nothing is cached then.
+    """
+    with _lock:
+        if _cache["data"] is not None and time.time() - _cache["t"] < ttl:
+            return _cache["data"]
+        data = fast_json.loads(_session.get(_GEO_URL, timeout=timeout).content)
+        _cache["t"], _cache["data"] = time.time(), data
+        return data
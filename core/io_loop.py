@@ -0,0 +1,47 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# uvloop (libuv) is optional and not available on Windows
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# One event loop thread and one pool per name for the whole process. Skills
+# are re-executed on every load, so they fetch these here instead of creating
+# their own at module level. At exit the pools are drained by
+# concurrent.futures itself and the loop thread is a daemon.
+# Callers may already be inside another event loop (e.g. the web gateway),
+# so coroutines always run on this dedicated loop thread.
+
+_lock = threading.Lock()
+_loop = None
+_executors = {}
+
+
+def get_loop():
+    """The shared background event loop (started on first use)."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="async-io", daemon=True).start()
+    return _loop
+
+
+def run_async(coro, timeout=None):
+    """Run a coroutine on the background loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+def get_executor(name, max_workers):
+    """A thread pool shared by everyone asking for the same name."""
+    with _lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+            _executors[name] = executor
+    return executor
+
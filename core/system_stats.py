@@ -0,0 +1,47 @@
+import threading
+
+import psutil
+
+# One hardware sampler per process. It lives here rather than in the skill
+# file because SkillManager re-executes skill files on every load; this
+# module is imported once, so the thread is only ever started once.
+_snapshot = None
+_lock = threading.Lock()
+
+
+def _read_snapshot(cpu, has_battery):
+    # Machines without a battery report None once; stop polling /sys / WMI for it
+    return {
+        "cpu": cpu,
+        "ram": psutil.virtual_memory().percent,
+        "batt": psutil.sensors_battery() if has_battery else None,
+    }
+
+
+def _sample_forever(has_battery):
+    global _snapshot
+    while True:
+        cpu = psutil.cpu_percent(interval=5.0)
+        # Swap in a whole new dict so readers never see a half-updated snapshot
+        _snapshot = _read_snapshot(cpu, has_battery)
+
+
+def start():
+    """Start the background sampler (no-op after the first call)."""
+    global _snapshot
+    with _lock:
+        if _snapshot is not None:
+            return
+        # Prime the counters so the first non-blocking read is meaningful
+        psutil.cpu_percent(interval=None)
+        snapshot = _read_snapshot(None, True)
+        _snapshot = snapshot
+        has_battery = snapshot["batt"] is not None
+        threading.Thread(target=_sample_forever, args=(has_battery,),
+                         name="system-stats", daemon=True).start()
+
+
+def snapshot():
+    """Latest {"cpu", "ram", "batt"} reading; cpu is None until the first sample."""
+    start()
+    return _snapshot
@@ -12,27 +12,91 @@ Features:
 """
 
 import subprocess
+import queue
 import vlc
 import os
 import time
 import threading
 import random
+import shutil
+from collections import deque
 import re
 import logging
-from typing import Optional, List, Dict, Tuple
+from types import MappingProxyType
+from typing import Optional, Dict, Tuple
 from enum import Enum
 from skill_manager import Skill
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+from core import fast_json
+from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume, IAudioEndpointVolumeCallback
 from ctypes import cast, POINTER
-from comtypes import CLSCTX_ALL
+from comtypes import CLSCTX_ALL, COMObject
 import json
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Logging is configured by the host application; the skill only emits records
+
+# Default skill configuration (copied per instance in _load_config)
+_DEFAULT_CONFIG = MappingProxyType({
+    "default_volume": 0.5,
+    "cache_duration": 3000,
+    "auto_radio": True,
+    "default_genre": "lo-fi",
+    "quality": "bestaudio",
+    "video_quality": "best[height<=720]",
+    "vlc_args": ("--quiet", "--no-video-title-show", "--network-caching=3000"),
+    "max_queue_size": 50,
+    "stream_timeout": 30,
+    "retry_attempts": 3,
+    "save_history": True,
+    "history_file": "music_history.json"
+})
+
+# Common VLC installation paths
+_VLC_SEARCH_PATHS = (
+    r"C:\Program Files (x86)\VideoLAN\VLC",
+    r"C:\Program Files\VideoLAN\VLC",
+    r"C:\Program Files\VideoLAN\vlc-3.0.0",
+    os.path.expanduser(r"~\AppData\Local\Programs\VideoLAN\VLC")
 )
 
+# Command words and filler stripped from music queries
+_STRIP_RE = re.compile(
+    r'(?:play|listen\s+to|put\s+on|queue|add|search\s+for|find|music|song|track|video|'
+    r'please|could\s+you|would\s+you|can\s+you|the|a|an)\s+',
+    re.IGNORECASE
+)
+_SPACES_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r"[\w']+")
+
+# VLC install directory, discovered once per process
+_VLC_PATH = None
+_VLC_PATH_LOCK = threading.Lock()
+
+
+def _discover_vlc() -> Optional[str]:
+    """Locate the VLC install directory (registry first, then common paths)"""
+    try:
+        import winreg
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"Software\VideoLAN\VLC") as key:
+            install_dir, _ = winreg.QueryValueEx(key, "InstallDir")
+        if install_dir and os.path.isdir(install_dir):
+            return install_dir
+    except (ImportError, OSError):
+        pass
+    
+    for path in _VLC_SEARCH_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _get_vlc_path() -> Optional[str]:
+    """Return the cached VLC install directory, discovering it on first use"""
+    global _VLC_PATH
+    with _VLC_PATH_LOCK:
+        if _VLC_PATH is None:
+            _VLC_PATH = _discover_vlc() or ""
+    return _VLC_PATH or None
+
 
 class PlaybackState(Enum):
     """Playback state enumeration"""
@@ -43,6 +107,19 @@ class PlaybackState(Enum):
     ERROR = "error"
 
 
+class _VolumeChangeCallback(COMObject):
+    """Keeps the skill's cached volume in sync with Windows volume changes"""
+    _com_interfaces_ = [IAudioEndpointVolumeCallback]
+    
+    def __init__(self, skill):
+        super().__init__()
+        self.skill = skill
+    
+    def OnNotify(self, pNotify):
+        self.skill.current_volume = pNotify.contents.fMasterVolume
+        return 0
+
+
 class MusicSkill(Skill):
     """Enhanced music streaming skill with continuous play and video support"""
     
@@ -52,6 +129,50 @@ class MusicSkill(Skill):
                 "video", "radio", "continue", "background", "pause", "resume", 
                 "skip", "genre", "station"]
     supported_intents = ["music_skill"]
+    
+    # Command dispatch: keyword/phrase -> command, commands in priority order
+    _COMMAND_WORDS = {
+        "radio": "radio", "background": "radio", "continue": "radio",
+        "video": "video",
+        "stop": "stop", "hush": "stop", "quiet": "stop",
+        "pause": "pause",
+        "resume": "resume",
+        "next": "skip", "skip": "skip",
+        "volume": "volume",
+        "queue": "queue",
+        "status": "status",
+        "history": "history",
+        "stations": "stations", "genres": "stations",
+    }
+    _COMMAND_PHRASES = (
+        ("keep playing", "radio"),
+        ("shut up", "stop"),
+        ("what's playing", "status"),
+        ("current song", "status"),
+        ("now playing", "status"),
+    )
+    _DISPATCH = {
+        "radio": "_cmd_radio",
+        "video": "_cmd_video",
+        "stop": "_cmd_stop",
+        "pause": "_cmd_pause",
+        "resume": "_cmd_resume",
+        "skip": "_cmd_skip",
+        "volume": "_cmd_volume",
+        "queue": "_cmd_queue",
+        "status": "_cmd_status",
+        "history": "_cmd_history",
+        "stations": "_cmd_stations",
+    }
+    _PLAY_WORDS = frozenset({"play", "music", "song", "listen"})
+    _OFF_WORDS = frozenset({"stop", "off"})
+    _SHOW_WORDS = frozenset({"on", "show"})
+    _HIDE_WORDS = frozenset({"off", "hide"})
+    _MAX_WORDS = frozenset({"max", "100"})
+    _MUTE_WORDS = frozenset({"mute", "silent"})
+    _VOLUME_UP_WORDS = frozenset({"up", "increase", "louder"})
+    _VOLUME_DOWN_WORDS = frozenset({"down", "decrease", "quieter", "lower"})
+    
     # Radio station definitions
     RADIO_STATIONS = {
         "lo-fi": {
@@ -126,10 +247,13 @@ class MusicSkill(Skill):
         # Load configuration
         self.config = self._load_config(config_path)
         
-        # Thread safety
-        self.queue_lock = threading.Lock()
-        self.state_lock = threading.Lock()
-        self.radio_lock = threading.Lock()
+        # Resolve yt-dlp once instead of searching PATH on every call
+        self._ytdlp = shutil.which("yt-dlp")
+        if not self._ytdlp:
+            self.logger.error("yt-dlp not found. Please install from https://github.com/yt-dlp/yt-dlp")
+        
+        # Thread safety: state_lock guards playback state and queue operations
+        self.state_lock = threading.RLock()
         
         # Playback state
         self.playback_state = PlaybackState.STOPPED
@@ -146,8 +270,20 @@ class MusicSkill(Skill):
         self.last_played = []
         self.max_history = 20
         
-        # Playback data
-        self.queue = []
+        # Precomputed radio query pools
+        self._by_genre = {g: list(st["queries"]) for g, st in self.RADIO_STATIONS.items()}
+        self._all_queries = [q for st in self.RADIO_STATIONS.values() for q in st["queries"]]
+        
+        # Pre-resolved radio stream URLs: deque of (query, url)
+        self._radio_url_cache = deque()
+        self._radio_cache_key = None
+        self._radio_cache_lock = threading.Lock()
+        self._radio_refilling = False
+        
+        # Playback data. Queue operations happen under state_lock, which also
+        # keeps _queue_snapshot (same songs, same order) in step for listing
+        self.queue = queue.Queue(maxsize=self.config["max_queue_size"])
+        self._queue_snapshot = deque()
         self.current_volume = self.config["default_volume"]
         self.is_playing = False
         self.vlc_instance = None
@@ -166,65 +302,48 @@ class MusicSkill(Skill):
     
     def _load_config(self, config_path: Optional[str]) -> Dict:
         """Load configuration from file or use defaults"""
-        default_config = {
-            "default_volume": 0.5,
-            "cache_duration": 3000,
-            "auto_radio": True,
-            "default_genre": "lo-fi",
-            "quality": "bestaudio",
-            "video_quality": "best[height<=720]",
-            "vlc_audio_args": ["--quiet", "--no-video", f"--network-caching=3000"],
-            "vlc_video_args": ["--quiet", f"--network-caching=3000"],
-            "max_queue_size": 50,
-            "stream_timeout": 30,
-            "retry_attempts": 3,
-            "save_history": True,
-            "history_file": "music_history.json"
-        }
+        default_config = dict(_DEFAULT_CONFIG)
         
         if config_path and os.path.exists(config_path):
             try:
                 with open(config_path, 'r') as f:
                     user_config = json.load(f)
                 default_config.update(user_config)
-                self.logger.info(f"Loaded configuration from {config_path}")
+                # Older configs split the VLC args by mode; audio/video is now
+                # chosen per media, so fold them into vlc_args
+                legacy_args = user_config.get("vlc_audio_args") or user_config.get("vlc_video_args")
+                if legacy_args and "vlc_args" not in user_config:
+                    self.logger.warning("vlc_audio_args/vlc_video_args are deprecated, use vlc_args")
+                    default_config["vlc_args"] = tuple(a for a in legacy_args if a != "--no-video")
+                self.logger.info("Loaded configuration from %s", config_path)
             except Exception as e:
-                self.logger.error(f"Failed to load config: {e}")
+                self.logger.error("Failed to load config: %s", e)
         
         return default_config
     
     def _setup_vlc(self):
         """Setup VLC with proper DLL paths"""
-        # Try common VLC installation paths
-        vlc_paths = [
-            r"C:\Program Files (x86)\VideoLAN\VLC",
-            r"C:\Program Files\VideoLAN\VLC",
-            r"C:\Program Files\VideoLAN\vlc-3.0.0",
-            os.path.expanduser(r"~\AppData\Local\Programs\VideoLAN\VLC")
-        ]
-        
+        path = _get_vlc_path()
         vlc_found = False
-        for path in vlc_paths:
-            if os.path.exists(path):
-                try:
-                    os.add_dll_directory(path)
-                    self.logger.info(f"Found VLC at: {path}")
-                    vlc_found = True
-                    break
-                except Exception as e:
-                    self.logger.debug(f"Failed to add DLL directory {path}: {e}")
+        if path:
+            try:
+                os.add_dll_directory(path)
+                self.logger.info("Found VLC at: %s", path)
+                vlc_found = True
+            except Exception as e:
+                self.logger.debug("Failed to add DLL directory %s: %s", path, e)
         
         if not vlc_found:
             self.logger.warning("VLC path not found, relying on system PATH")
         
-        # Create initial VLC instance (audio-only)
+        # Create the single VLC instance; audio/video is chosen per media
         try:
-            args = " ".join(self.config["vlc_audio_args"])
+            args = " ".join(self.config["vlc_args"])
             self.vlc_instance = vlc.Instance(args)
             self.vlc_player = self.vlc_instance.media_player_new()
             self.logger.info("VLC engine initialized successfully")
         except Exception as e:
-            self.logger.error(f"Failed to initialize VLC: {e}")
+            self.logger.error("Failed to initialize VLC: %s", e)
             self.vlc_player = None
     
     def _init_volume_control(self):
@@ -239,11 +358,20 @@ class MusicSkill(Skill):
             self.volume_control = cast(interface, POINTER(IAudioEndpointVolume))
             current_vol = self.volume_control.GetMasterVolumeLevelScalar()
             self.current_volume = current_vol
-            self.logger.info(f"Windows volume control initialized: {int(current_vol * 100)}%")
+            self.logger.info("Windows volume control initialized: %d%%", int(current_vol * 100))
+            
+            # Track later changes via notifications instead of polling COM
+            try:
+                self._volume_callback = _VolumeChangeCallback(self)
+                self.volume_control.RegisterControlChangeNotify(self._volume_callback)
+            except Exception as e:
+                self.logger.debug("Volume change notifications unavailable: %s", e)
+                self._volume_callback = None
         except Exception as e:
-            self.logger.warning(f"Could not initialize pycaw volume control: {e}")
+            self.logger.warning("Could not initialize pycaw volume control: %s", e)
             self.logger.info("Falling back to software volume control")
             self.volume_control = None
+            self._volume_callback = None
     
     def _load_user_preferences(self):
         """Load user preferences from file"""
@@ -257,7 +385,7 @@ class MusicSkill(Skill):
                 self.show_video = prefs.get("show_video", self.show_video)
                 self.logger.info("Loaded user preferences")
             except Exception as e:
-                self.logger.error(f"Failed to load preferences: {e}")
+                self.logger.error("Failed to load preferences: %s", e)
     
     def _save_user_preferences(self):
         """Save user preferences to file"""
@@ -270,11 +398,10 @@ class MusicSkill(Skill):
                 "radio_mode": self.radio_mode,
                 "continuous_play": self.continuous_play
             }
-            with open(pref_file, 'w') as f:
-                json.dump(prefs, f, indent=2)
+            fast_json.dump_file_atomic(pref_file, prefs, indent=True)
             self.logger.debug("User preferences saved")
         except Exception as e:
-            self.logger.error(f"Failed to save preferences: {e}")
+            self.logger.error("Failed to save preferences: %s", e)
     
     def _save_to_history(self, track_info: Dict):
         """Save track to playback history"""
@@ -300,15 +427,14 @@ class MusicSkill(Skill):
             if len(history) > self.max_history:
                 history = history[:self.max_history]
             
-            with open(history_file, 'w') as f:
-                json.dump(history, f, indent=2)
+            fast_json.dump_file_atomic(history_file, history, indent=True)
             
             self.last_played.insert(0, track_info)
             if len(self.last_played) > self.max_history:
                 self.last_played = self.last_played[:self.max_history]
                 
         except Exception as e:
-            self.logger.error(f"Failed to save history: {e}")
+            self.logger.error("Failed to save history: %s", e)
     
     def _get_stream_url(self, query: str, audio_only: bool = True) -> Optional[str]:
         """
@@ -321,11 +447,14 @@ class MusicSkill(Skill):
         Returns:
             Stream URL or None if failed
         """
+        if not self._ytdlp:
+            return None
+        
         for attempt in range(self.config["retry_attempts"]):
             try:
                 # Build command
                 cmd = [
-                    "yt-dlp",
+                    self._ytdlp,
                     "-g",
                     f"ytsearch1:{query}" if not query.startswith(("http://", "https://")) else query,
                     "--no-warnings",
@@ -340,7 +469,8 @@ class MusicSkill(Skill):
                     cmd.extend(["--format", self.config["video_quality"]])
                 
                 # Execute
-                self.logger.debug(f"Executing yt-dlp command: {' '.join(cmd)}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Executing yt-dlp command: %s", " ".join(cmd))
                 result = subprocess.run(
                     cmd, 
                     capture_output=True, 
@@ -351,35 +481,107 @@ class MusicSkill(Skill):
                 
                 if result.returncode == 0 and result.stdout.strip():
                     url = result.stdout.strip().split('\n')[0]
-                    self.logger.info(f"Retrieved stream URL for: {query[:50]}...")
+                    self.logger.info("Retrieved stream URL for: %.50s...", query)
                     return url
                 else:
-                    self.logger.warning(f"yt-dlp attempt {attempt + 1} failed: {result.stderr}")
+                    self.logger.warning("yt-dlp attempt %d failed: %s", attempt + 1, result.stderr)
                     
             except subprocess.TimeoutExpired:
-                self.logger.warning(f"yt-dlp timeout on attempt {attempt + 1}")
+                self.logger.warning("yt-dlp timeout on attempt %d", attempt + 1)
             except FileNotFoundError:
                 self.logger.error("yt-dlp not found. Please install from https://github.com/yt-dlp/yt-dlp")
                 return None
             except Exception as e:
-                self.logger.error(f"Unexpected error in yt-dlp: {e}")
+                self.logger.error("Unexpected error in yt-dlp: %s", e)
             
             # Wait before retry
             if attempt < self.config["retry_attempts"] - 1:
                 time.sleep(2 ** attempt)  # Exponential backoff
         
-        self.logger.error(f"Failed to get stream URL after {self.config['retry_attempts']} attempts: {query}")
+        self.logger.error(
+            "Failed to get stream URL after %d attempts: %s",
+            self.config["retry_attempts"], query
+        )
         return None
     
-    def _create_vlc_instance(self, audio_only: bool = True) -> Optional[vlc.Instance]:
-        """Create VLC instance with appropriate parameters"""
+    def _warm_radio_cache(self, n: int = 5) -> int:
+        """
+        Resolve several radio queries with a single yt-dlp invocation
+        
+        Args:
+            n: Number of radio queries to resolve
+            
+        Returns:
+            Number of URLs added to the cache
+        """
+        audio_only = not self.show_video
+        key = (self.radio_genre, audio_only)
+        pool = self._by_genre.get(self.radio_genre, self._all_queries)
+        queries = random.sample(pool, k=min(n, len(pool)))
+        if not queries or not self._ytdlp:
+            return 0
+        
+        cmd = [self._ytdlp, "-g", "--no-warnings", "--quiet", "--no-playlist",
+               "--format", self.config["quality"] if audio_only else self.config["video_quality"]]
+        cmd.extend(f"ytsearch1:{q}" for q in queries)
+        
         try:
-            args = self.config["vlc_audio_args"] if audio_only else self.config["vlc_video_args"]
-            instance = vlc.Instance(" ".join(args))
-            return instance
-        except Exception as e:
-            self.logger.error(f"Failed to create VLC instance: {e}")
-            return None
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                shell=False,
+                timeout=self.config["stream_timeout"] * 2
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            self.logger.warning("Radio cache warm-up failed: %s", e)
+            return 0
+        
+        urls = result.stdout.split()
+        # yt-dlp prints one URL per input; only trust the batch if it lines up
+        if result.returncode != 0 or len(urls) != len(queries):
+            self.logger.debug("Radio cache warm-up got %d URLs for %d queries", len(urls), len(queries))
+            return 0
+        
+        with self._radio_cache_lock:
+            if self._radio_cache_key != key:
+                self._radio_url_cache.clear()
+                self._radio_cache_key = key
+            self._radio_url_cache.extend(zip(queries, urls))
+        self.logger.info("Radio cache warmed with %d tracks", len(urls))
+        return len(urls)
+    
+    def _refill_radio_cache_async(self):
+        """Refill the radio URL cache in a background thread"""
+        with self._radio_cache_lock:
+            if self._radio_refilling:
+                return
+            self._radio_refilling = True
+        
+        def refill():
+            try:
+                self._warm_radio_cache()
+            except Exception as e:
+                self.logger.error("Radio cache refill error: %s", e)
+            finally:
+                with self._radio_cache_lock:
+                    self._radio_refilling = False
+        
+        threading.Thread(target=refill, daemon=True).start()
+    
+    def _pop_radio_url(self) -> Optional[Tuple[str, str]]:
+        """Take a pre-resolved (query, url) pair for the current genre/mode"""
+        key = (self.radio_genre, not self.show_video)
+        with self._radio_cache_lock:
+            if self._radio_cache_key != key:
+                self._radio_url_cache.clear()
+                self._radio_cache_key = key
+            item = self._radio_url_cache.popleft() if self._radio_url_cache else None
+            remaining = len(self._radio_url_cache)
+        
+        if remaining < 2:
+            self._refill_radio_cache_async()
+        return item
     
     def _toggle_video_mode(self, show_video: Optional[bool] = None) -> str:
         """
@@ -403,26 +605,14 @@ class MusicSkill(Skill):
             current_track = self.current_track
             was_playing = self.is_playing
             
-            # Stop current playback
+            # Stop current playback; the instance is kept and the next
+            # media carries the audio/video option
             if was_playing:
                 self._stop_playback()
-                time.sleep(0.5)
-            
-            # Release old instance
-            if self.vlc_instance:
-                self.vlc_player.release()
-                self.vlc_instance.release()
-            
-            # Create new instance
-            self.vlc_instance = self._create_vlc_instance(not self.show_video)
-            if not self.vlc_instance:
-                return "Failed to create VLC instance."
-            
-            self.vlc_player = self.vlc_instance.media_player_new()
             
             # Setup video window if needed
             if self.show_video:
-                self.vlc_player.set_hwnd(0)
+                self.vlc_player.set_hwnd(self.video_hwnd or 0)
                 self.video_hidden = False
                 
                 if current_track:
@@ -436,7 +626,7 @@ class MusicSkill(Skill):
                 return f"Switched to {'video' if self.show_video else 'audio'} mode."
                 
         except Exception as e:
-            self.logger.error(f"Failed to toggle video mode: {e}")
+            self.logger.error("Failed to toggle video mode: %s", e)
             return f"Error switching modes: {e}"
     
     def _set_volume(self, level: float) -> bool:
@@ -462,7 +652,7 @@ class MusicSkill(Skill):
                 self.vlc_player.audio_set_volume(int(level * 100))
             
             self.current_volume = level
-            self.logger.info(f"Volume set to {int(level * 100)}%")
+            self.logger.info("Volume set to %d%%", int(level * 100))
             
             # Save preference
             self._save_user_preferences()
@@ -470,16 +660,17 @@ class MusicSkill(Skill):
             return True
             
         except Exception as e:
-            self.logger.error(f"Volume control error: {e}")
+            self.logger.error("Volume control error: %s", e)
             return False
     
-    def _play_song(self, query: str, from_radio: bool = False) -> Optional[str]:
+    def _play_song(self, query: str, from_radio: bool = False, url: Optional[str] = None) -> Optional[str]:
         """
         Play a song or video
         
         Args:
             query: Song/video query or URL
             from_radio: Whether this is from radio mode
+            url: Already resolved stream URL, skips the yt-dlp lookup
             
         Returns:
             Status message or None if from_radio
@@ -488,7 +679,8 @@ class MusicSkill(Skill):
             return "Player not available."
         
         # Get stream URL
-        url = self._get_stream_url(query, audio_only=not self.show_video)
+        if not url:
+            url = self._get_stream_url(query, audio_only=not self.show_video)
         if not url:
             if not from_radio:
                 return f"Could not find: {query}"
@@ -503,6 +695,8 @@ class MusicSkill(Skill):
             # Load and play media
             media = self.vlc_instance.media_new(url)
             media.add_option(f'network-caching={self.config["cache_duration"]}')
+            if not self.show_video:
+                media.add_option(':no-video')
             
             self.vlc_player.set_media(media)
             self.vlc_player.play()
@@ -540,11 +734,11 @@ class MusicSkill(Skill):
                 mode = "with video" if self.show_video and not self.video_hidden else "audio only"
                 return f"Now playing: {query} ({mode})"
             
-            self.logger.info(f"Radio playing: {query}")
+            self.logger.info("Radio playing: %s", query)
             return None
             
         except Exception as e:
-            self.logger.error(f"Playback error: {e}")
+            self.logger.error("Playback error: %s", e)
             if not from_radio:
                 return f"Failed to play: {query}"
             return None
@@ -576,10 +770,9 @@ class MusicSkill(Skill):
     
     def _skip_to_next(self) -> str:
         """Skip to next track in queue or radio"""
-        with self.queue_lock:
-            if self.queue:
-                next_song = self.queue.pop(0)
-                return self._play_song(next_song)
+        next_song = self._pop_queue()
+        if next_song:
+            return self._play_song(next_song)
         
         # If radio mode is active, play next radio track
         if self.radio_mode:
@@ -606,18 +799,18 @@ class MusicSkill(Skill):
         if genre:
             self.radio_genre = genre
         
-        # Get station queries
-        if self.radio_genre in self.RADIO_STATIONS:
-            queries = self.RADIO_STATIONS[self.radio_genre]["queries"]
-        else:
-            # Fallback to all queries
-            queries = []
-            for station in self.RADIO_STATIONS.values():
-                queries.extend(station["queries"])
+        # Use a pre-resolved stream if one is cached
+        cached = self._pop_radio_url()
+        if cached:
+            query, url = cached
+            if self._play_song(query, from_radio=True, url=url) is None:
+                return True
+        
+        # Get station queries (fallback to all queries)
+        queries = self._by_genre.get(self.radio_genre, self._all_queries)
         
         # Try up to 3 different queries
-        for _ in range(3):
-            query = random.choice(queries)
+        for query in random.sample(queries, k=min(3, len(queries))):
             result = self._play_song(query, from_radio=True)
             if result is None:  # Success
                 return True
@@ -634,31 +827,51 @@ class MusicSkill(Skill):
         Returns:
             New queue length
         """
-        with self.queue_lock:
-            if len(self.queue) >= self.config["max_queue_size"]:
-                self.queue.pop(0)  # Remove oldest if queue is full
-            self.queue.append(query)
-            return len(self.queue)
+        with self.state_lock:
+            if self.queue.full():
+                # Remove oldest if queue is full
+                self.queue.get_nowait()
+                self._queue_snapshot.popleft()
+            self.queue.put_nowait(query)
+            self._queue_snapshot.append(query)
+            return self.queue.qsize()
+    
+    def _pop_queue(self) -> Optional[str]:
+        """Take the next queued song, or None if the queue is empty"""
+        with self.state_lock:
+            try:
+                song = self.queue.get_nowait()
+            except queue.Empty:
+                return None
+            self._queue_snapshot.popleft()
+            return song
     
     def _clear_queue(self):
         """Clear the playback queue"""
-        with self.queue_lock:
-            self.queue.clear()
+        with self.state_lock:
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue_snapshot.clear()
     
     def _get_queue_status(self) -> str:
         """Get formatted queue status"""
-        with self.queue_lock:
-            if not self.queue:
-                return "Queue is empty."
-            
-            queue_list = []
-            for i, song in enumerate(self.queue[:10], 1):
-                queue_list.append(f"{i}. {song}")
-            
-            if len(self.queue) > 10:
-                queue_list.append(f"... and {len(self.queue) - 10} more")
-            
-            return "Queue:\n" + "\n".join(queue_list)
+        with self.state_lock:
+            pending = list(self._queue_snapshot)
+        
+        if not pending:
+            return "Queue is empty."
+        
+        queue_list = []
+        for i, song in enumerate(pending[:10], 1):
+            queue_list.append(f"{i}. {song}")
+        
+        if len(pending) > 10:
+            queue_list.append(f"... and {len(pending) - 10} more")
+        
+        return "Queue:\n" + "\n".join(queue_list)
     
     def _get_playback_info(self) -> Dict:
         """Get detailed playback information"""
@@ -669,7 +882,7 @@ class MusicSkill(Skill):
             "video_enabled": self.show_video and not self.video_hidden,
             "radio_mode": self.radio_mode,
             "radio_genre": self.radio_genre,
-            "queue_length": len(self.queue),
+            "queue_length": self.queue.qsize(),
             "continuous_play": self.continuous_play
         }
         
@@ -701,13 +914,10 @@ class MusicSkill(Skill):
                             time.sleep(1)
                             
                             # Try queue first
-                            next_track = None
-                            with self.queue_lock:
-                                if self.queue:
-                                    next_track = self.queue.pop(0)
+                            next_track = self._pop_queue()
                             
                             if next_track:
-                                self.logger.info(f"Playing next from queue: {next_track}")
+                                self.logger.info("Playing next from queue: %s", next_track)
                                 self._play_song(next_track)
                             # Radio mode
                             elif self.radio_mode:
@@ -728,7 +938,7 @@ class MusicSkill(Skill):
                     time.sleep(2)
                     
                 except Exception as e:
-                    self.logger.error(f"Playback monitor error: {e}")
+                    self.logger.error("Playback monitor error: %s", e)
                     time.sleep(5)
         
         def monitor_radio():
@@ -748,7 +958,7 @@ class MusicSkill(Skill):
                     time.sleep(10)
                     
                 except Exception as e:
-                    self.logger.error(f"Radio monitor error: {e}")
+                    self.logger.error("Radio monitor error: %s", e)
                     time.sleep(30)
         
         # Start threads
@@ -759,20 +969,10 @@ class MusicSkill(Skill):
     def _extract_query(self, text: str) -> Optional[str]:
         """Extract music query from text"""
         # Remove command words and common phrases
-        patterns_to_remove = [
-            r'play\s+', r'listen\s+to\s+', r'put\s+on\s+', r'queue\s+', 
-            r'add\s+', r'search\s+for\s+', r'find\s+', r'music\s+',
-            r'song\s+', r'track\s+', r'video\s+', r'please\s+',
-            r'could\s+you\s+', r'would\s+you\s+', r'can\s+you\s+',
-            r'the\s+', r'a\s+', r'an\s+'
-        ]
-        
-        query = text.lower()
-        for pattern in patterns_to_remove:
-            query = re.sub(pattern, '', query, flags=re.IGNORECASE)
+        query = _STRIP_RE.sub('', text.lower())
         
         # Remove extra spaces
-        query = re.sub(r'\s+', ' ', query).strip()
+        query = _SPACES_RE.sub(' ', query).strip()
         
         return query if query else None
     
@@ -784,6 +984,11 @@ class MusicSkill(Skill):
             # Stop playback
             self._stop_playback()
             
+            # Stop volume notifications
+            if self.volume_control and self._volume_callback:
+                self.volume_control.UnregisterControlChangeNotify(self._volume_callback)
+                self._volume_callback = None
+            
             # Release VLC resources
             if self.vlc_player:
                 self.vlc_player.release()
@@ -797,148 +1002,163 @@ class MusicSkill(Skill):
             self.logger.info("Music skill cleanup complete")
             
         except Exception as e:
-            self.logger.error(f"Error during cleanup: {e}")
+            self.logger.error("Error during cleanup: %s", e)
     
-    def run(self, parameters: dict):
-        """
-        Main skill execution method
-        
-        Args:
-            parameters: Dictionary containing user_input and other parameters
-            
-        Returns:
-            Response message or None
-        """
-        text = parameters.get("user_input", "").strip()
-        
-        # Extract query for music commands
-        query = self._extract_query(text)
-        
-        # --- RADIO / CONTINUOUS PLAY ---
-        if any(word in text.lower() for word in ["radio", "background", "continue", "keep playing"]):
-            if "stop" in text.lower() or "off" in text.lower():
-                self.radio_mode = False
-                self.continuous_play = False
-                return "Radio mode disabled. Music will stop after current track."
-            
-            # Set specific genre
-            for genre in self.RADIO_STATIONS:
-                if genre in text.lower():
-                    self.radio_genre = genre
-                    self.radio_mode = True
-                    if not self.is_playing:
-                        self._play_radio_track(genre)
-                    station_name = self.RADIO_STATIONS[genre]["name"]
-                    return f"{station_name} radio enabled. Music will continue playing."
-            
-            # General radio
-            self.radio_mode = True
-            if not self.is_playing:
-                self._play_radio_track()
-            return "Radio mode enabled. Music will continue playing automatically."
-        
-        # --- VIDEO CONTROL ---
-        if "video" in text.lower():
-            if "on" in text.lower() or "show" in text.lower():
-                return self._toggle_video_mode(show_video=True)
-            elif "off" in text.lower() or "hide" in text.lower():
-                return self._toggle_video_mode(show_video=False)
-            else:
-                return self._toggle_video_mode()
-        
-        # --- PLAYBACK CONTROL ---
-        if any(word in text.lower() for word in ["stop", "hush", "shut up", "quiet"]):
-            self._stop_playback()
+    # --- RADIO / CONTINUOUS PLAY ---
+    def _cmd_radio(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        if tokens & self._OFF_WORDS:
             self.radio_mode = False
             self.continuous_play = False
-            return "Music stopped."
+            return "Radio mode disabled. Music will stop after current track."
         
-        if "pause" in text.lower():
-            if self.is_playing:
-                self._pause_playback()
-                return "Playback paused."
-            return "Nothing is playing."
-        
-        if "resume" in text.lower() or "continue" in text.lower():
-            if self.playback_state == PlaybackState.PAUSED:
-                self._resume_playback()
-                return "Playback resumed."
-            return "Playback is not paused."
-        
-        if any(word in text.lower() for word in ["next", "skip"]):
-            return self._skip_to_next()
-        
-        # --- VOLUME CONTROL ---
-        if "volume" in text.lower():
-            if "max" in text.lower() or "100" in text.lower():
-                self._set_volume(1.0)
-                return "Maximum volume! 🔊"
-            elif "mute" in text.lower() or "silent" in text.lower():
-                self._set_volume(0.0)
-                return "Audio muted. 🔇"
-            elif any(w in text.lower() for w in ["up", "increase", "louder"]):
-                new_vol = min(1.0, self.current_volume + 0.1)
-                self._set_volume(new_vol)
-                return f"Volume: {int(new_vol * 100)}%"
-            elif any(w in text.lower() for w in ["down", "decrease", "quieter", "lower"]):
-                new_vol = max(0.0, self.current_volume - 0.1)
-                self._set_volume(new_vol)
-                return f"Volume: {int(new_vol * 100)}%"
-            else:
-                return f"Current volume: {int(self.current_volume * 100)}%"
+        # Set specific genre
+        for genre in self.RADIO_STATIONS:
+            if genre in tl:
+                self.radio_genre = genre
+                self.radio_mode = True
+                if not self.is_playing:
+                    self._play_radio_track(genre)
+                station_name = self.RADIO_STATIONS[genre]["name"]
+                return f"{station_name} radio enabled. Music will continue playing."
         
-        # --- QUEUE MANAGEMENT ---
-        if "clear queue" in text.lower():
+        # General radio
+        self.radio_mode = True
+        if not self.is_playing:
+            self._play_radio_track()
+        return "Radio mode enabled. Music will continue playing automatically."
+    
+    # --- VIDEO CONTROL ---
+    def _cmd_video(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        if tokens & self._SHOW_WORDS:
+            return self._toggle_video_mode(show_video=True)
+        elif tokens & self._HIDE_WORDS:
+            return self._toggle_video_mode(show_video=False)
+        else:
+            return self._toggle_video_mode()
+    
+    # --- PLAYBACK CONTROL ---
+    def _cmd_stop(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        self._stop_playback()
+        self.radio_mode = False
+        self.continuous_play = False
+        return "Music stopped."
+    
+    def _cmd_pause(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        if self.is_playing:
+            self._pause_playback()
+            return "Playback paused."
+        return "Nothing is playing."
+    
+    def _cmd_resume(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        if self.playback_state == PlaybackState.PAUSED:
+            self._resume_playback()
+            return "Playback resumed."
+        return "Playback is not paused."
+    
+    def _cmd_skip(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        return self._skip_to_next()
+    
+    # --- VOLUME CONTROL ---
+    def _cmd_volume(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        if tokens & self._MAX_WORDS:
+            self._set_volume(1.0)
+            return "Maximum volume! 🔊"
+        elif tokens & self._MUTE_WORDS:
+            self._set_volume(0.0)
+            return "Audio muted. 🔇"
+        elif tokens & self._VOLUME_UP_WORDS:
+            new_vol = min(1.0, self.current_volume + 0.1)
+            self._set_volume(new_vol)
+            return f"Volume: {int(new_vol * 100)}%"
+        elif tokens & self._VOLUME_DOWN_WORDS:
+            new_vol = max(0.0, self.current_volume - 0.1)
+            self._set_volume(new_vol)
+            return f"Volume: {int(new_vol * 100)}%"
+        else:
+            return f"Current volume: {int(self.current_volume * 100)}%"
+    
+    # --- QUEUE MANAGEMENT ---
+    def _cmd_queue(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        if "clear queue" in tl:
             self._clear_queue()
             return "Queue cleared."
         
-        if "show queue" in text.lower() or "what's in queue" in text.lower():
+        if "show queue" in tl or "what's in queue" in tl:
             return self._get_queue_status()
         
-        if "add" in text.lower() and "queue" in text.lower() and query:
+        if "add" in tokens and query:
             queue_len = self._add_to_queue(query)
             return f"Added '{query}' to queue. ({queue_len} total)"
         
-        # --- STATUS / INFO ---
-        if any(phrase in text.lower() for phrase in ["what's playing", "current song", "now playing", "status"]):
-            info = self._get_playback_info()
-            
-            if info["current_track"]:
-                response = f"Playing: {info['current_track']}\n"
-                response += f"Volume: {info['volume']}% | "
-                response += f"State: {info['playback_state']}\n"
-                
-                if "position" in info and "duration" in info:
-                    response += f"Progress: {info['position']} / {info['duration']}"
-                
-                if info['radio_mode']:
-                    response += f"\nRadio: {info['radio_genre']}"
-                
-                return response
-            else:
-                return "Nothing is playing right now."
+        return None
+    
+    # --- STATUS / INFO ---
+    def _cmd_status(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        info = self._get_playback_info()
         
-        if "history" in text.lower():
-            if not self.last_played:
-                return "No playback history yet."
+        if info["current_track"]:
+            response = f"Playing: {info['current_track']}\n"
+            response += f"Volume: {info['volume']}% | "
+            response += f"State: {info['playback_state']}\n"
+            
+            if "position" in info and "duration" in info:
+                response += f"Progress: {info['position']} / {info['duration']}"
             
-            history_list = []
-            for i, track in enumerate(self.last_played[:5], 1):
-                track_name = track.get('query', 'Unknown')[:40]
-                time_str = track.get('timestamp', 'Unknown time')
-                history_list.append(f"{i}. {track_name} ({time_str})")
+            if info['radio_mode']:
+                response += f"\nRadio: {info['radio_genre']}"
             
-            return "Recent history:\n" + "\n".join(history_list)
+            return response
+        else:
+            return "Nothing is playing right now."
+    
+    def _cmd_history(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        if not self.last_played:
+            return "No playback history yet."
         
-        if "stations" in text.lower() or "genres" in text.lower():
-            stations_list = []
-            for genre, info in self.RADIO_STATIONS.items():
-                stations_list.append(f"• {genre}: {info['description']}")
+        history_list = []
+        for i, track in enumerate(self.last_played[:5], 1):
+            track_name = track.get('query', 'Unknown')[:40]
+            time_str = track.get('timestamp', 'Unknown time')
+            history_list.append(f"{i}. {track_name} ({time_str})")
+        
+        return "Recent history:\n" + "\n".join(history_list)
+    
+    def _cmd_stations(self, tl: str, tokens: frozenset, query: Optional[str]) -> Optional[str]:
+        stations_list = []
+        for genre, info in self.RADIO_STATIONS.items():
+            stations_list.append(f"• {genre}: {info['description']}")
+        
+        return "Available radio stations:\n" + "\n".join(stations_list)
+    
+    def run(self, parameters: dict):
+        """
+        Main skill execution method
+        
+        Args:
+            parameters: Dictionary containing user_input and other parameters
             
-            return "Available radio stations:\n" + "\n".join(stations_list)
+        Returns:
+            Response message or None
+        """
+        text = parameters.get("user_input", "").strip()
+        tl = text.lower()
+        tokens = frozenset(_WORD_RE.findall(tl))
+        
+        # Extract query for music commands
+        query = self._extract_query(text)
+        
+        # Route to the highest-priority command mentioned in the input
+        commands = {self._COMMAND_WORDS[t] for t in tokens if t in self._COMMAND_WORDS}
+        commands.update(cmd for phrase, cmd in self._COMMAND_PHRASES if phrase in tl)
+        if commands:
+            for command, handler in self._DISPATCH.items():
+                if command in commands:
+                    result = getattr(self, handler)(tl, tokens, query)
+                    if result is not None:
+                        return result
         
         # --- PLAY MUSIC ---
-        if any(trigger in text.lower() for trigger in ["play", "music", "song", "listen", "put on"]) and query:
+        if (tokens & self._PLAY_WORDS or "put on" in tl) and query:
             # Turn off radio mode for specific requests
             self.radio_mode = False
             return self._play_song(query)
@@ -1,40 +1,130 @@
-import json
 import os
+import re
 import time
+import heapq
 from datetime import datetime, timedelta
 from skill_manager import Skill
+from core import fast_json
 
 class ReminderSkill(Skill):
     name = "Reminder Skill"
     description = "Sets timed reminders and alerts you in the background."
     keywords = ["remind", "reminder", "task", "todo"]
     supported_intents = ["reminder_skill"]
+    # "remind me to [task] in [X] minutes" -> (task, minutes)
+    _REMINDER_RE = re.compile(r"^(?:.*?remind me to\s+)?(.+?)\s+in\s+(\d+)\s*minute", re.IGNORECASE)
+
     def __init__(self):
-        self.db_file = "tasks.json"
+        # Append-only log: one task record per line, plus {"id", "notified"} updates
+        self.db_file = "tasks.jsonl"
+        self.legacy_db_file = "tasks.json"
         if not os.path.exists(self.db_file):
-            with open(self.db_file, 'w') as f:
-                json.dump([], f)
+            self._migrate_legacy_db()
+
+        # In-memory tasks (id -> task) + min-heap of (due_epoch, id) for pending reminders
+        self._tasks = {}
+        self._heap = []
+        self._next_id = 1
+        self._update_records = 0
+        self._stamp = None
+        self._load_tasks()
+
+    def _migrate_legacy_db(self):
+        """Convert the old single-array tasks.json into the JSONL log."""
+        tasks = []
+        if os.path.exists(self.legacy_db_file):
+            try:
+                tasks = fast_json.load_file(self.legacy_db_file)
+            except Exception as e:
+                print(f"⚠️ [REMINDER ERROR]: {e}")
+
+        self._write_records(dict(t, id=i) for i, t in enumerate(tasks, 1))
+
+    def _write_records(self, records):
+        """Replace the log with records atomically, so a crash keeps the old copy."""
+        fast_json.write_atomic(self.db_file, b"".join(fast_json.dumps(r) + b"\n" for r in records))
+
+    def _load_tasks(self):
+        """(Re)load tasks from disk and rebuild the pending-reminder heap."""
+        self._tasks = {}
+        self._update_records = 0
+        self._stamp = self._file_stamp()
+        try:
+            with open(self.db_file, 'rb') as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    # One bad line (e.g. a torn write) shouldn't lose every task
+                    try:
+                        record = fast_json.loads(line)
+                        if "task" in record:
+                            self._tasks[record["id"]] = record
+                        elif record["id"] in self._tasks:
+                            self._tasks[record["id"]]["notified"] = record["notified"]
+                            self._update_records += 1
+                    except (ValueError, TypeError, KeyError) as e:
+                        print(f"⚠️ [REMINDER ERROR]: Skipping bad line {line_no} in {self.db_file}: {e}")
+        except OSError as e:
+            print(f"⚠️ [REMINDER ERROR]: {e}")
+        self._next_id = max(self._tasks, default=0) + 1
+
+        self._heap = []
+        for task_id, t in self._tasks.items():
+            if not t.get('notified'):
+                try:
+                    due = datetime.strptime(t['time'], "%Y-%m-%d %H:%M:%S").timestamp()
+                except (ValueError, TypeError, KeyError) as e:
+                    print(f"⚠️ [REMINDER ERROR]: Skipping task {task_id}: {e}")
+                    continue
+                self._heap.append((due, task_id))
+        heapq.heapify(self._heap)
+
+    def _file_stamp(self):
+        """(mtime, size) of the task log, or None if it can't be read"""
+        try:
+            st = os.stat(self.db_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _append_records(self, records):
+        with open(self.db_file, 'ab') as f:
+            f.write(b"".join(fast_json.dumps(r) + b"\n" for r in records))
+        self._stamp = self._file_stamp()
+
+    def _compact(self):
+        """Fold notification updates back into their task records."""
+        self._write_records(self._tasks.values())
+        self._update_records = 0
+        self._stamp = self._file_stamp()
+
+    def _reload_if_changed(self):
+        # Only re-read the file if something else changed it; size catches
+        # appends within the filesystem's mtime resolution
+        if self._file_stamp() != self._stamp:
+            self._load_tasks()
 
     def reminder_monitor(self):
         """Called by CrystalBrain's background loop every second."""
         try:
-            with open(self.db_file, 'r') as f:
-                tasks = json.load(f)
-
-            now = datetime.now()
-            updated = False
-
-            for t in tasks:
-                task_time = datetime.strptime(t['time'], "%Y-%m-%d %H:%M:%S")
-                if now >= task_time and not t['notified']:
-                    # 🔥 TRIGGER THE ALERT
-                    print(f"\n🔔 [REMINDER]: Lucky, it's time to: {t['task']}!")
-                    t['notified'] = True
-                    updated = True
-
-            if updated:
-                with open(self.db_file, 'w') as f:
-                    json.dump(tasks, f, indent=4)
+            self._reload_if_changed()
+
+            now = time.time()
+            fired = []
+
+            while self._heap and self._heap[0][0] <= now:
+                _, task_id = heapq.heappop(self._heap)
+                t = self._tasks[task_id]
+                # 🔥 TRIGGER THE ALERT
+                print(f"\n🔔 [REMINDER]: Lucky, it's time to: {t['task']}!")
+                t['notified'] = True
+                fired.append({"id": task_id, "notified": True})
+
+            if fired:
+                self._append_records(fired)
+                self._update_records += len(fired)
+                if self._update_records > len(self._tasks) // 2:
+                    self._compact()
         except Exception as e:
             print(f"⚠️ [REMINDER ERROR]: {e}")
 
@@ -43,23 +133,26 @@ class ReminderSkill(Skill):
         
         # Simple Logic: "remind me to [task] in [X] minutes"
         if "in" in text and "minute" in text:
+            match = self._REMINDER_RE.search(text)
+            if not match:
+                return "I couldn't parse the time. Try: 'remind me to [task] in [number] minutes'."
+
+            task_part = match.group(1).strip()
+            minutes = int(match.group(2))
             try:
-                task_part = text.split("remind me to")[-1].split("in")[0].strip()
-                minutes = int([s for s in text.split() if s.isdigit()][0])
-                
                 remind_time = datetime.now() + timedelta(minutes=minutes)
                 time_str = remind_time.strftime("%Y-%m-%d %H:%M:%S")
 
-                with open(self.db_file, 'r') as f:
-                    tasks = json.load(f)
-                
-                tasks.append({"task": task_part, "time": time_str, "notified": False})
-                
-                with open(self.db_file, 'w') as f:
-                    json.dump(tasks, f, indent=4)
+                self._reload_if_changed()
+                task_id = self._next_id
+                self._next_id += 1
+                task = {"id": task_id, "task": task_part, "time": time_str, "notified": False}
+                self._tasks[task_id] = task
+                heapq.heappush(self._heap, (remind_time.replace(microsecond=0).timestamp(), task_id))
+                self._append_records([task])
 
                 return f"Clock synchronized. I'll remind you to '{task_part}' in {minutes} minutes, Lucky."
-            except:
-                return "I couldn't parse the time. Try: 'remind me to [task] in [number] minutes'."
+            except Exception as e:
+                return f"⚠️ I couldn't save that reminder: {e}"
 
-        return "I can set reminders. Just say 'remind me to [task] in [x] minutes'."
\ No newline at end of file
+        return "I can set reminders. Just say 'remind me to [task] in [x] minutes'."
@@ -1,47 +1,109 @@
+import re
+import time
+import functools
+import xml.etree.ElementTree as ET
+import requests
+from requests.adapters import HTTPAdapter
 import newspaper
 from newspaper import Article
+from concurrent.futures import ThreadPoolExecutor
 from skill_manager import Skill
 
+URL_RE = re.compile(r"https?://\S+")
+
+# Briefing sources -> RSS feed with their current headlines
+NEWS_FEEDS = {
+    "https://www.bbc.com/news": "https://feeds.bbci.co.uk/news/rss.xml",
+    "https://techcrunch.com": "https://techcrunch.com/feed/",
+}
+
 class WebResearcher(Skill):
     name = "Web Researcher"
     description = "Scrapes and summarizes news or documentation from URLs."
     keywords = ["summarize", "research", "news", "what's happening", "article"]
     supported_intents = ["researcher_skill"]
+    feed_ttl = 300  # seconds before a news feed is fetched again
+
+    def __init__(self):
+        # feed_url -> (fetched_at, [headline, ...])
+        self._feed_cache = {}
+
+        # Keep-alive session for article downloads
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers["User-Agent"] = newspaper.Config().browser_user_agent
+
+        # Repeat URLs are answered from memory
+        self._summarize = functools.lru_cache(maxsize=128)(self._summarize_url)
+
+    def _summarize_url(self, url):
+        """Download, parse and summarize an article -> (title, summary, keywords)."""
+        resp = self._session.get(url, timeout=10)
+        resp.raise_for_status()
+
+        article = Article(url)
+        article.download(input_html=resp.text)
+        article.parse()
+
+        # Perform NLP (Summary & Keywords)
+        article.nlp()
+        return article.title, article.summary, tuple(article.keywords)
+
+    def _get_headlines(self, feed_url, limit=3):
+        """Read headline titles from an RSS feed, at most once per TTL window."""
+        cached = self._feed_cache.get(feed_url)
+        if cached and time.time() - cached[0] < self.feed_ttl:
+            return cached[1][:limit]
+
+        resp = self._session.get(feed_url, timeout=10)
+        resp.raise_for_status()
+        root = ET.fromstring(resp.content)
+        titles = [(t.text or "").strip() for t in root.iterfind("./channel/item/title")]
+
+        self._feed_cache[feed_url] = (time.time(), titles)
+        return titles[:limit]
+
+    def _format_summary(self, url):
+        try:
+            title, summary, keywords = self._summarize(url)
+            
+            response = f"### 📰 Summary: {title}\n"
+            response += f"> {summary[:500]}...\n\n"
+            response += f"**Key Points:** {', '.join(keywords[:5])}"
+            return response
+        except Exception as e:
+            return f"I couldn't reach that site. The galactic firewall might be up. Error: {e}"
+
     def run(self, parameters: dict):
-        text = parameters.get("user_input", "").lower()
+        raw_text = parameters.get("user_input", "")
+        text = raw_text.lower()
 
-        # --- 1. RESEARCH A SPECIFIC URL ---
-        if "http" in text:
-            # Extract the URL from the text
-            url = [word for word in text.split() if "http" in word][0]
-            try:
-                article = Article(url)
-                article.download()
-                article.parse()
-                
-                # Perform NLP (Summary & Keywords)
-                article.nlp()
-                
-                response = f"### 📰 Summary: {article.title}\n"
-                response += f"> {article.summary[:500]}...\n\n"
-                response += f"**Key Points:** {', '.join(article.keywords[:5])}"
-                return response
-            except Exception as e:
-                return f"I couldn't reach that site. The galactic firewall might be up. Error: {e}"
+        # --- 1. RESEARCH SPECIFIC URLS ---
+        # Extract from the original text: URL paths are case-sensitive
+        urls = list(dict.fromkeys(URL_RE.findall(raw_text)))
+        if len(urls) == 1:
+            return self._format_summary(urls[0])
+        if urls:
+            # Several links: fetch and summarize them concurrently
+            with ThreadPoolExecutor(max_workers=min(8, len(urls))) as executor:
+                return "\n\n".join(executor.map(self._format_summary, urls))
 
         # --- 2. GET NEWS BRIEFING ---
         if "news" in text or "happening" in text:
             site_url = "https://www.bbc.com/news" # Default source
             if "tech" in text: site_url = "https://techcrunch.com"
             
-            paper = newspaper.build(site_url, memoize_articles=False)
+            try:
+                titles = self._get_headlines(NEWS_FEEDS[site_url])
+            except Exception as e:
+                return f"I couldn't reach that site. The galactic firewall might be up. Error: {e}"
             briefing = [f"Here is your briefing from {site_url}:"]
             
-            # Get the top 3 headlines
-            for i, article in enumerate(paper.articles[:3]):
-                article.download()
-                article.parse()
-                briefing.append(f"{i+1}. **{article.title}**")
+            # Get the top 3 headlines (straight from the feed, no article downloads)
+            for i, title in enumerate(titles):
+                briefing.append(f"{i+1}. **{title}**")
             
             return "\n".join(briefing) + "\n\nWould you like me to summarize any of these for you?"
 
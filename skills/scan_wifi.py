@@ -2,9 +2,22 @@ import scapy.all as scapy
 import socket
 import logging
 import requests
-import json
 import time
+import threading
+import ipaddress
+from collections import namedtuple
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor, wait
 from skill_manager import Skill
+from core import fast_json, io_loop
+
+# One discovered host; ipn is the IPv4 address as an int (sort key)
+Device = namedtuple("Device", "ip mac ipn vendor")
+
+# Reverse-DNS lookups start while ARP replies arrive, on a pool from
+# core.io_loop so skill reloads don't create another one
+_DNS_WORKERS = 32
+_DNS_TIMEOUT = 3.0  # total wait for a batch; slower hosts get no hostname
 
 class WifiScanSkill(Skill):
     name = "WiFi Scanner"
@@ -14,8 +27,19 @@ class WifiScanSkill(Skill):
     supported_intents = ["scan_wifi"]
     def __init__(self):
         self.logger = logging.getLogger("Crystal.WifiScan")
+        # Vendor DB is loaded on first lookup, not at construction
         self.mac_vendors = {}
-        self._load_mac_vendors()
+        self._prefix_index = {}
+        self._vendors_loaded = False
+        self._vendors_lock = threading.Lock()
+        
+        # ip -> (hostname, resolved_at) so re-scans skip known hosts
+        self._hostname_cache = {}
+        self._hostname_futures = {}
+        self.hostname_ttl = 600
+        
+        # (interface, network range) from the last successful detection
+        self._cached_range = None
     
     def _load_mac_vendors(self):
         """Load MAC vendor database for device identification"""
@@ -24,19 +48,17 @@ class WifiScanSkill(Skill):
             import os
             cache_file = "mac_vendors.json"
             if os.path.exists(cache_file):
-                with open(cache_file, 'r') as f:
-                    self.mac_vendors = json.load(f)
-                    print(f"✅ [WIFI SCAN]: Loaded {len(self.mac_vendors)} MAC vendors from cache")
-                    return
+                self.mac_vendors = fast_json.load_file(cache_file)
+                print(f"✅ [WIFI SCAN]: Loaded {len(self.mac_vendors)} MAC vendors from cache")
+                return
             
             # Try to fetch from online API
             print("📡 [WIFI SCAN]: Fetching MAC vendor database...")
             response = requests.get("https://macvendors.co/api/vendors", timeout=10)
             if response.status_code == 200:
-                self.mac_vendors = response.json()
+                self.mac_vendors = fast_json.loads(response.content)
                 # Save to cache
-                with open(cache_file, 'w') as f:
-                    json.dump(self.mac_vendors, f)
+                fast_json.dump_file(cache_file, self.mac_vendors)
                 print(f"✅ [WIFI SCAN]: Loaded {len(self.mac_vendors)} MAC vendors")
             else:
                 print("⚠️ [WIFI SCAN]: Could not fetch MAC vendors, using local database")
@@ -99,25 +121,74 @@ class WifiScanSkill(Skill):
             "00:26:5A": "D-Link",
         }
     
+    # Assignment block sizes: MA-S (36 bit), MA-M (28 bit), MA-L/OUI (24 bit)
+    PREFIX_BITS = (36, 28, 24)
+    
+    def _build_oui_index(self):
+        """Index vendors by prefix length and integer prefix for longest-prefix lookups"""
+        self._prefix_index = {bits: {} for bits in self.PREFIX_BITS}
+        for prefix, vendor in self.mac_vendors.items():
+            prefix, _, length = prefix.partition('/')
+            digits = prefix.replace(':', '').replace('-', '').replace('.', '')
+            try:
+                bits = int(length) if length else len(digits) * 4
+                value = int(digits, 16)
+            except ValueError:
+                continue
+            if bits not in self._prefix_index:
+                continue
+            # "/NN" entries may be padded with trailing zeros
+            value >>= max(0, len(digits) * 4 - bits)
+            self._prefix_index[bits][value] = vendor
+    
+    def _ensure_vendors_loaded(self):
+        """Load and index the MAC vendor database the first time it's needed"""
+        if self._vendors_loaded:
+            return
+        with self._vendors_lock:
+            if not self._vendors_loaded:
+                self._load_mac_vendors()
+                self._build_oui_index()
+                self._vendors_loaded = True
+    
     def get_vendor_from_mac(self, mac_address):
-        """Look up vendor from MAC address"""
+        """Look up vendor from MAC address (longest matching prefix wins)"""
         if not mac_address:
             return "Unknown"
         
-        # Normalize MAC address
-        mac = mac_address.upper().replace('-', ':')
-        
-        # Try different prefix lengths
-        prefixes = [mac[:8], mac[:6]]
+        self._ensure_vendors_loaded()
+        digits = mac_address.replace(':', '').replace('-', '').replace('.', '')
+        try:
+            mac = int(digits[:12].ljust(12, '0'), 16)
+        except ValueError:
+            return "Unknown"
         
-        for prefix in prefixes:
-            if prefix in self.mac_vendors:
-                return self.mac_vendors[prefix]
+        for bits in self.PREFIX_BITS:
+            vendor = self._prefix_index[bits].get(mac >> (48 - bits))
+            if vendor is not None:
+                return vendor
         
         return "Unknown"
     
+    def _batch_vendor(self, macs):
+        """Vendor for each MAC, looking up each distinct MAC once"""
+        lookup = self.get_vendor_from_mac
+        cache = {}
+        vendors = []
+        for mac in macs:
+            vendor = cache.get(mac)
+            if vendor is None:
+                vendor = cache[mac] = lookup(mac)
+            vendors.append(vendor)
+        return vendors
+    
     def get_local_ip_range(self):
         """Automatically finds your network range"""
+        # Reuse the last result while the default interface is unchanged
+        iface = str(scapy.conf.iface)
+        if self._cached_range and self._cached_range[0] == iface:
+            return self._cached_range[1]
+        
         try:
             # Get local IP
             s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -130,6 +201,7 @@ class WifiScanSkill(Skill):
             network_range = f"{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}.0/24"
             
             print(f"🌐 [WIFI SCAN]: Local IP: {local_ip}, Network: {network_range}")
+            self._cached_range = (iface, network_range)
             return network_range
             
         except Exception as e:
@@ -146,20 +218,41 @@ class WifiScanSkill(Skill):
             broadcast = scapy.Ether(dst="ff:ff:ff:ff:ff:ff")
             arp_request_broadcast = broadcast / arp_request
             
-            # Send request with timeout
-            answered_list = scapy.srp(arp_request_broadcast, timeout=3, verbose=False)[0]
+            network = ipaddress.ip_network(ip_range, strict=False)
+            replies = {}
+            
+            def on_arp_reply(packet):
+                # Only "is-at" replies from the scanned range
+                if not packet.haslayer(scapy.ARP) or packet[scapy.ARP].op != 2:
+                    return
+                ip = packet[scapy.ARP].psrc
+                if ip in replies or ipaddress.ip_address(ip) not in network:
+                    return
+                replies[ip] = packet[scapy.ARP].hwsrc
+                # Start the hostname lookup while we keep listening
+                self._prefetch_hostname(ip)
+            
+            # Broadcast once the sniffer is up, then collect replies for the timeout
+            scapy.sniff(
+                filter="arp",
+                prn=on_arp_reply,
+                store=False,
+                timeout=3,
+                started_callback=lambda: scapy.sendp(arp_request_broadcast, verbose=False)
+            )
             
-            devices = []
-            for sent, received in answered_list:
-                device_info = {
-                    "ip": received.psrc,
-                    "mac": received.hwsrc,
-                    "vendor": self.get_vendor_from_mac(received.hwsrc)
-                }
-                devices.append(device_info)
+            ips = list(replies)
+            macs = list(replies.values())
+            vendors = self._batch_vendor(macs)
+            to_int = int.from_bytes
+            inet_aton = socket.inet_aton
+            devices = [
+                Device(ip, mac, to_int(inet_aton(ip), "big"), vendor)
+                for ip, mac, vendor in zip(ips, macs, vendors)
+            ]
             
-            # Sort devices by IP address
-            devices.sort(key=lambda x: [int(i) for i in x['ip'].split('.')])
+            # Sort devices by IP address (as a 32-bit integer)
+            devices.sort(key=attrgetter("ipn"))
             
             return devices
             
@@ -177,6 +270,38 @@ class WifiScanSkill(Skill):
         except:
             return ""
     
+    def _prefetch_hostname(self, ip):
+        """Start a background reverse lookup unless a fresh result is cached"""
+        cached = self._hostname_cache.get(ip)
+        if cached and time.time() - cached[1] < self.hostname_ttl:
+            return
+        if ip not in self._hostname_futures:
+            pool = io_loop.get_executor("wifi-dns", _DNS_WORKERS)
+            self._hostname_futures[ip] = pool.submit(self.get_hostname, ip)
+    
+    def resolve_hostnames(self, ips):
+        """Reverse-resolve many IPs concurrently, reusing recent results"""
+        for ip in ips:
+            self._prefetch_hostname(ip)
+        
+        pending = [self._hostname_futures[ip] for ip in ips if ip in self._hostname_futures]
+        wait(pending, timeout=_DNS_TIMEOUT)
+        
+        now = time.time()
+        hostnames = {}
+        for ip in ips:
+            future = self._hostname_futures.get(ip)
+            if future is not None:
+                if not future.done():
+                    # Still resolving: no hostname this time, keep the lookup for the next scan
+                    hostnames[ip] = ""
+                    continue
+                del self._hostname_futures[ip]
+                self._hostname_cache[ip] = (future.result(), now)
+            hostnames[ip] = self._hostname_cache[ip][0]
+        
+        return hostnames
+    
     def run(self, parameters: dict):
         user_input = parameters.get("user_input", "").lower()
         
@@ -224,10 +349,13 @@ Note: Requires admin/root privileges on some systems."""
         result += f"Devices Found: **{len(devices)}**\n"
         result += "=" * 60 + "\n\n"
         
+        # Resolve all hostnames up front instead of one blocking lookup per row
+        hostnames = self.resolve_hostnames([device.ip for device in devices])
+        
         # Group devices by type/vendor
         device_groups = {}
         for device in devices:
-            vendor = device['vendor']
+            vendor = device.vendor
             if vendor not in device_groups:
                 device_groups[vendor] = []
             device_groups[vendor].append(device)
@@ -242,11 +370,10 @@ Note: Requires admin/root privileges on some systems."""
                 result += f"📱 **{vendor}** ({len(vendor_devices)}):\n"
             
             for device in vendor_devices:
-                # Try to get hostname
-                hostname = self.get_hostname(device['ip'])
+                hostname = hostnames.get(device.ip, "")
                 hostname_display = f" ({hostname})" if hostname else ""
                 
-                result += f"  • `{device['ip']:15}` - {device['mac']}{hostname_display}\n"
+                result += f"  • `{device.ip:15}` - {device.mac}{hostname_display}\n"
             
             result += "\n"
         
@@ -307,11 +434,14 @@ class SimpleNetworkScanner(Skill):
         
         print(f"🔍 [SIMPLE SCAN]: Pinging common addresses...")
         
-        for i in range(1, 255):
-            ip = f"{base_ip}{i}"
-            if self.ping_host(ip):
-                devices.append(ip)
-                print(f"✅ Found: {ip}")
+        # Pings are I/O bound, so run them concurrently
+        ips = [f"{base_ip}{i}" for i in range(1, 255)]
+        with ThreadPoolExecutor(max_workers=64) as executor:
+            results = executor.map(self.ping_host, ips)
+            for ip, alive in zip(ips, results):
+                if alive:
+                    devices.append(ip)
+                    print(f"✅ Found: {ip}")
         
         if devices:
             return f"Found {len(devices)} active devices:\n" + "\n".join([f"• {ip}" for ip in devices])
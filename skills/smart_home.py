@@ -1,13 +1,165 @@
 import asyncio
-import json
+import functools
+import ipaddress
 import os
 import socket
+import threading
 import time
-import requests
+import aiohttp
+from collections import defaultdict
 from datetime import datetime
 from skill_manager import Skill
+from core import background, fast_json, io_loop
 import re
 
+# Reverse DNS is blocking; one pool thread per scanned host so misses overlap
+# (the event loop and the pool live in core.io_loop, shared across reloads)
+_DNS_WORKERS = 50
+_DNS_TIMEOUT = 2.0
+
+
+def _safe_gethost(ip):
+    try:
+        return socket.gethostbyaddr(ip)[0].lower()
+    except Exception:
+        return ""
+
+
+# Top-level command keywords, matched in one pass over the input
+# (longer alternatives first so "lights" isn't split into "light")
+_COMMAND_GROUPS = {
+    "scan": "scan", "discover": "scan", "find devices": "scan",
+    "television": "tv", "tv": "tv",
+    "lights": "lights", "light": "lights", "lamp": "lights",
+    "plug": "plug", "socket": "plug", "outlet": "plug",
+    "create scene": "create_scene", "save scene": "create_scene",
+    "list devices": "list_devices", "show devices": "list_devices",
+    "list scenes": "list_scenes", "show scenes": "list_scenes",
+    "help": "help",
+}
+_COMMAND_RE = re.compile("|".join(re.escape(k) for k in sorted(_COMMAND_GROUPS, key=len, reverse=True)))
+
+_WORD_RE = re.compile(r"\w+")
+PCT_RE = re.compile(r'(\d+)%')
+
+# Per-device-class HTTP budget (seconds): one dead plug shouldn't stall a fan-out
+_TIMEOUTS = {"plug": 0.5, "light": 0.8, "tv": 1.5, "speaker": 1.0, "device": 2.0}
+
+# Plug firmware -> on/off paths; the one that answers is stored per device
+_PLUG_ENDPOINTS = {
+    "tasmota": {"on": "/cm?cmnd=Power%20On", "off": "/cm?cmnd=Power%20Off"},
+    "shelly": {"on": "/relay/0?turn=on", "off": "/relay/0?turn=off"},
+    "esp-relay": {"on": "/switch/0/on", "off": "/switch/0/off"},
+}
+
+# Complete commands answered by a single dict lookup before keyword matching
+# (none of these phrases can reach an earlier branch of the cascade)
+_EXACT_COMMANDS = {
+    "scan": "_cmd_scan", "scan devices": "_cmd_scan", "discover": "_cmd_scan",
+    "discover devices": "_cmd_scan", "find devices": "_cmd_scan",
+    "list devices": "_cmd_list_devices", "show devices": "_cmd_list_devices",
+    "list scenes": "_cmd_list_scenes", "show scenes": "_cmd_list_scenes",
+    "help": "_cmd_help",
+}
+
+# Keys derived from a device at runtime; stripped if found in an older save
+_DERIVED_KEYS = ("type_lc", "hostname_lc", "room_lc", "_display_row", "_list_row")
+
+# Scene device names -> device_categories bucket
+_SCENE_CATEGORIES = (("light", "lights"), ("tv", "tv"), ("plug", "plugs"), ("speaker", "speakers"))
+
+
+def _keyword_re(keywords):
+    """Alternation that reports every keyword hit, including overlapping ones"""
+    ordered = sorted(keywords, key=len, reverse=True)
+    return re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+
+
+def _first_rule(regex, rule_of, text):
+    """Lowest rule index among the keywords found in text (None if none)"""
+    return min((rule_of[m.group(1)] for m in regex.finditer(text)), default=None)
+
+
+# Brand rules in priority order: (device type, ports, hostname keywords)
+_BRAND_RULES = (
+    ("Samsung Smart TV", (8001,), ("samsung",)),
+    ("Roku TV", (8060,), ("roku",)),
+    ("Android/Google TV", (8008,), ("android", "chromecast")),
+    ("LG webOS TV", (3000,), ("lg",)),
+    ("Sonos Speaker", (9000,), ("sonos",)),
+    ("Home Assistant", (5000, 8123), ("hass",)),
+    ("Philips Hue Bridge", (), ("hue",)),
+    ("Amazon Echo", (), ("echo", "alexa")),
+    ("Google Home/Nest", (), ("google", "nest")),
+    ("TP-Link Smart Plug", (), ("tplink", "kasa")),
+    ("Belkin Wemo", (), ("wemo",)),
+)
+_PORT_RULE = {port: i for i, (_, ports, _) in enumerate(_BRAND_RULES) for port in ports}
+_BRAND_RULE = {kw: i for i, (_, _, kws) in enumerate(_BRAND_RULES) for kw in kws}
+_BRAND_RE = _keyword_re(_BRAND_RULE)
+
+# Hostname keyword -> room; earlier entries win
+_ROOM_KEYWORDS = (
+    ("living", "living room"),
+    ("bedroom", "bedroom"),
+    ("kitchen", "kitchen"),
+    ("bath", "bathroom"),
+    ("office", "office"),
+    ("garage", "garage"),
+    ("dining", "dining room"),
+    ("hall", "hallway"),
+    ("tv", "living room"),  # TVs usually in living room
+    ("speaker", "living room"),  # Main speaker often in living room
+)
+_ROOM_RULE = {kw: i for i, (kw, _) in enumerate(_ROOM_KEYWORDS)}
+_ROOM_RE = _keyword_re(_ROOM_RULE)
+
+
+@functools.lru_cache(maxsize=None)
+def _category_matcher(category_items):
+    """Reverse keyword -> category index map plus one regex over all keywords"""
+    rule_of = {}
+    for i, (_, keywords) in enumerate(category_items):
+        for keyword in keywords:
+            rule_of.setdefault(keyword, i)
+    return _keyword_re(rule_of), rule_of
+
+
+@functools.lru_cache(maxsize=2048)
+def _identify_device_impl(port, hostname_lower, category_items):
+    """Device type from port + hostname (pure, so repeat scans hit the cache)"""
+    # Check for specific brands/patterns: port or hostname, first rule wins
+    hits = [i for i in (_PORT_RULE.get(port), _first_rule(_BRAND_RE, _BRAND_RULE, hostname_lower))
+            if i is not None]
+    if hits:
+        return _BRAND_RULES[min(hits)][0]
+    
+    # Generic identification
+    category_re, rule_of = _category_matcher(category_items)
+    i = _first_rule(category_re, rule_of, hostname_lower)
+    if i is not None:
+        return category_items[i][0].title()
+    
+    return "Smart Device"
+
+
+@functools.lru_cache(maxsize=2048)
+def _guess_room_impl(hostname_lower, device_type_lower):
+    """Room from hostname keywords, else a default per device type"""
+    i = _first_rule(_ROOM_RE, _ROOM_RULE, hostname_lower)
+    if i is not None:
+        return _ROOM_KEYWORDS[i][1]
+    
+    # Default based on device type
+    if "tv" in device_type_lower:
+        return "living room"
+    elif "speaker" in device_type_lower:
+        return "living room"
+    elif "light" in device_type_lower:
+        return "bedroom"
+    
+    return "unknown"
+
 
 class SmartHome(Skill):
     name = "Smart Home"
@@ -16,8 +168,16 @@ class SmartHome(Skill):
                 "turn on", "turn off", "volume", "brightness", "color", "scan", "discover", "control",
                 "automation", "scene", "routine", "living room", "bedroom", "kitchen"]
     supported_intents = ["smart_home"]
+    
     def __init__(self):
         self.devices_path = "core/smart_devices.json"
+        self._session = None  # aiohttp session, bound to the background loop
+        self._timeouts = {kind: aiohttp.ClientTimeout(total=secs) for kind, secs in _TIMEOUTS.items()}
+        
+        # Saves hand a snapshot to core.background's shared writer, which
+        # coalesces bursts and flushes at exit. Mutations of devices/scenes
+        # and taking a snapshot share one lock.
+        self._state_lock = threading.RLock()
         self.scenes_path = "core/smart_scenes.json"
         
         # 🚨 FIX: Define default_scenes BEFORE calling _load_scenes()
@@ -62,6 +222,7 @@ class SmartHome(Skill):
         # Now load devices and scenes
         self.devices = self._load_devices()
         self.scenes = self._load_scenes()  # This will now work correctly
+        self._compile_scene_matcher()
         
         # TV control protocols
         self.tv_protocols = {
@@ -125,6 +286,9 @@ class SmartHome(Skill):
             "camera": ["camera", "security", "ring", "arlo", "wyze", "blink"],
             "sensors": ["sensor", "motion", "door", "window", "contact", "humidity"]
         }
+        # Hashable snapshot for the memoized identifier
+        self._category_items = tuple((category, tuple(keywords))
+                                     for category, keywords in self.device_categories.items())
         
         # Room mappings
         self.rooms = {
@@ -135,6 +299,9 @@ class SmartHome(Skill):
             "office": ["lights", "plug", "speaker"],
             "garage": ["lights", "plug", "camera"]
         }
+        self._room_re = re.compile(r'\b(' + '|'.join(map(re.escape, sorted(self.rooms, key=len, reverse=True))) + r')\b')
+        
+        self._rebuild_indexes()
         
         print("✅ [SMART HOME]: Complete smart home system initialized")
         print(f"   Devices: {len(self.devices)}, Scenes: {len(self.scenes)}")
@@ -143,52 +310,123 @@ class SmartHome(Skill):
         """Load discovered devices from file"""
         if os.path.exists(self.devices_path):
             try:
-                with open(self.devices_path, "r") as f:
-                    devices = json.load(f)
-                    return devices
+                # The parse is shared across reloads, so copy each device
+                # (dropping derived keys older saves carried) before use
+                devices = fast_json.load_file_cached(self.devices_path)
+                return {
+                    ip: {k: v for k, v in device.items() if k not in _DERIVED_KEYS}
+                    for ip, device in devices.items()
+                }
             except:
                 pass
         return {}
 
     def _save_devices(self):
-        """Save discovered devices to file"""
-        try:
-            os.makedirs(os.path.dirname(self.devices_path), exist_ok=True)
-            with open(self.devices_path, "w") as f:
-                json.dump(self.devices, f, indent=2)
-        except:
-            pass
+        """Schedule a save of discovered devices"""
+        with self._state_lock:
+            # Copy each device so later in-place edits don't race the writer
+            snapshot = {ip: dict(device) for ip, device in self.devices.items()}
+        background.schedule_write(self.devices_path, snapshot, indent=True)
 
     def _load_scenes(self):
         """Load saved scenes from file"""
         if os.path.exists(self.scenes_path):
             try:
-                with open(self.scenes_path, "r") as f:
-                    scenes = json.load(f)
-                    # Merge with default scenes (defaults take priority)
-                    merged_scenes = self.default_scenes.copy()
-                    merged_scenes.update(scenes)
-                    return merged_scenes
+                # Shared parse; scenes are only ever replaced, not mutated
+                scenes = fast_json.load_file_cached(self.scenes_path)
+                # Merge with default scenes (defaults take priority)
+                merged_scenes = self.default_scenes.copy()
+                merged_scenes.update(scenes)
+                return merged_scenes
             except:
                 pass
         return self.default_scenes.copy()
 
     def _save_scenes(self):
-        """Save scenes to file"""
-        try:
-            os.makedirs(os.path.dirname(self.scenes_path), exist_ok=True)
-            with open(self.scenes_path, "w") as f:
-                # Don't save default scenes, only custom ones
-                custom_scenes = {}
-                for name, scene in self.scenes.items():
-                    if name not in self.default_scenes:
-                        custom_scenes[name] = scene
-                json.dump(custom_scenes, f, indent=2)
-        except:
-            pass
+        """Schedule a save of custom scenes"""
+        with self._state_lock:
+            # Don't save default scenes, only custom ones
+            snapshot = {name: scene for name, scene in self.scenes.items()
+                        if name not in self.default_scenes}
+        background.schedule_write(self.scenes_path, snapshot, indent=True)
+
+    def _rebuild_indexes(self):
+        """Flatten devices into an IP-ordered list and bucket them by category and room
+
+        Call after any change to self.devices: the match fields and listing
+        rows below are derived from it and never saved.
+        """
+        def ip_key(item):
+            try:
+                return int(ipaddress.IPv4Address(item[0]))
+            except ValueError:
+                return 0
+        
+        ordered = sorted(self.devices.items(), key=ip_key)
+        self._devs = [device for _, device in ordered]
+        
+        # Lowercased match fields per IP; kept out of the device dicts so
+        # they are never written to smart_devices.json
+        self._match = {
+            ip: {
+                "type": device.get("type", "").lower(),
+                "hostname": device.get("hostname", "").lower(),
+                "room": device.get("room", "").lower(),
+            }
+            for ip, device in ordered
+        }
+        # Preformatted (scan summary, device list) rows per IP
+        self._rows = {
+            ip: (f"  • {device.get('type')} ({device.get('ip')})",
+                 f"• {device.get('type')} at {device.get('ip')} ({device.get('room', 'unknown')})")
+            for ip, device in ordered
+        }
+        
+        # Buckets hold the device dicts themselves: no per-command IP lookups
+        by_type = defaultdict(list)
+        by_room = defaultdict(list)
+        for ip, device in ordered:
+            match = self._match[ip]
+            for category, keywords in self.device_categories.items():
+                if any(keyword in match["type"] for keyword in keywords):
+                    by_type[category].append(device)
+            by_room[match["room"]].append(device)
+        self._by_type = by_type
+        self._by_room = by_room
+
+    def _match_field(self, ip, field):
+        """Lowercased type/hostname/room of a known device ("" if unknown)"""
+        return self._match.get(ip, {}).get(field, "")
+
+    def _find_scene_device(self, device_name):
+        """Resolve a scene device name ("bedroom lights", "tv") to an IP"""
+        name = device_name.lower()
+        for word, category in _SCENE_CATEGORIES:
+            if word in name:
+                devices = self._by_type.get(category, [])
+                # Prefer a device in the room the scene names
+                for device in devices:
+                    room = self._match_field(device["ip"], "room")
+                    if room and room in name:
+                        return device["ip"]
+                return devices[0]["ip"] if devices else None
+        
+        for ip, match in self._match.items():
+            if name in match["type"] or name in match["hostname"]:
+                return ip
+        return None
+
+    def _compile_scene_matcher(self):
+        """One regex over all scene names instead of a substring scan per scene"""
+        names = sorted(self.scenes, key=len, reverse=True)
+        self._scene_re = re.compile("|".join(map(re.escape, names))) if names else None
 
     def _scan_network(self):
         """Scan local network for smart devices"""
+        return io_loop.run_async(self._scan_network_async())
+
+    async def _scan_network_async(self):
+        """Probe all IP/port pairs concurrently instead of one connect at a time"""
         print("🔍 [SMART HOME]: Scanning network for smart devices...")
         
         # Common smart device ports
@@ -215,135 +453,111 @@ class SmartHome(Skill):
         except:
             base_ip = "192.168.1"
         
-        discovered = []
+        loop = asyncio.get_running_loop()
+        dns_pool = io_loop.get_executor("smart-home-dns", _DNS_WORKERS)
+        limit = asyncio.Semaphore(256)  # cap open sockets
+        ips = [f"{base_ip}.{i}" for i in range(1, 51)]
+        ports = list(smart_ports)
         
-        # Scan IP range
-        for i in range(1, 51):
-            ip = f"{base_ip}.{i}"
-            
-            # Get hostname
-            try:
-                hostname = socket.gethostbyaddr(ip)[0].lower()
-            except:
-                hostname = ""
-            
-            # Check ports
-            for port, service in smart_ports.items():
+        async def probe(ip, port):
+            # Bare nonblocking socket; the loop's selector (epoll) waits for writability
+            async with limit:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
                 try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(0.2)
-                    result = sock.connect_ex((ip, port))
+                    await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout=0.2)
+                    return True
+                except (OSError, asyncio.TimeoutError):
+                    return False
+                finally:
                     sock.close()
+        
+        async def lookup(ip):
+            # Don't let a slow resolver miss hold the whole scan
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(dns_pool, _safe_gethost, ip),
+                                              timeout=_DNS_TIMEOUT)
+            except asyncio.TimeoutError:
+                return ""
+        
+        # Hostname lookups and port probes all run at once
+        hostnames, open_ports = await asyncio.gather(
+            asyncio.gather(*(lookup(ip) for ip in ips)),
+            asyncio.gather(*(probe(ip, port) for ip in ips for port in ports))
+        )
+        
+        discovered = []
+        for n, ip in enumerate(ips):
+            hostname = hostnames[n]
+            row = open_ports[n * len(ports):(n + 1) * len(ports)]
+            
+            # First open port (in smart_ports order) identifies the device
+            for port, is_open in zip(ports, row):
+                if not is_open:
+                    continue
+                device_type = self._identify_device(ip, port, hostname)
+                if device_type:
+                    device_info = {
+                        "ip": ip,
+                        "hostname": hostname,
+                        "type": device_type,
+                        "port": port,
+                        "service": smart_ports[port],
+                        "room": self._guess_room(hostname, device_type),
+                        "last_seen": datetime.now().isoformat(),
+                        "controllable": True
+                    }
                     
-                    if result == 0:
-                        # Identify device type
-                        device_type = self._identify_device(ip, port, hostname)
-                        if device_type:
-                            device_info = {
-                                "ip": ip,
-                                "hostname": hostname,
-                                "type": device_type,
-                                "port": port,
-                                "service": service,
-                                "room": self._guess_room(hostname, device_type),
-                                "last_seen": datetime.now().isoformat(),
-                                "controllable": True
-                            }
-                            
-                            self.devices[ip] = device_info
-                            discovered.append(device_info)
-                            print(f"✅ Found: {device_type} at {ip} ({hostname})")
-                        break
-                except:
-                    pass
+                    with self._state_lock:
+                        self.devices[ip] = device_info
+                    discovered.append(device_info)
+                    print(f"✅ Found: {device_type} at {ip} ({hostname})")
+                break
         
+        self._rebuild_indexes()
         self._save_devices()
         return discovered
 
     def _identify_device(self, ip, port, hostname):
         """Identify device type"""
-        hostname_lower = hostname.lower()
-        
-        # Check for specific brands/patterns
-        if port == 8001 or "samsung" in hostname_lower:
-            return "Samsung Smart TV"
-        elif port == 8060 or "roku" in hostname_lower:
-            return "Roku TV"
-        elif port == 8008 or "android" in hostname_lower or "chromecast" in hostname_lower:
-            return "Android/Google TV"
-        elif port == 3000 or "lg" in hostname_lower:
-            return "LG webOS TV"
-        elif port == 9000 or "sonos" in hostname_lower:
-            return "Sonos Speaker"
-        elif port == 5000 or port == 8123 or "hass" in hostname_lower:
-            return "Home Assistant"
-        elif "hue" in hostname_lower:
-            return "Philips Hue Bridge"
-        elif "echo" in hostname_lower or "alexa" in hostname_lower:
-            return "Amazon Echo"
-        elif "google" in hostname_lower or "nest" in hostname_lower:
-            return "Google Home/Nest"
-        elif "tplink" in hostname_lower or "kasa" in hostname_lower:
-            return "TP-Link Smart Plug"
-        elif "wemo" in hostname_lower:
-            return "Belkin Wemo"
-        
-        # Generic identification
-        for category, keywords in self.device_categories.items():
-            for keyword in keywords:
-                if keyword in hostname_lower:
-                    return category.title()
-        
-        return "Smart Device"
+        return _identify_device_impl(port, hostname.lower(), self._category_items)
 
     def _guess_room(self, hostname, device_type):
         """Guess which room a device is in"""
-        hostname_lower = hostname.lower()
-        
-        room_keywords = {
-            "living": "living room",
-            "bedroom": "bedroom",
-            "kitchen": "kitchen",
-            "bath": "bathroom",
-            "office": "office",
-            "garage": "garage",
-            "dining": "dining room",
-            "hall": "hallway",
-            "tv": "living room",  # TVs usually in living room
-            "speaker": "living room"  # Main speaker often in living room
-        }
-        
-        for keyword, room in room_keywords.items():
-            if keyword in hostname_lower:
-                return room
-        
-        # Default based on device type
-        if "tv" in device_type.lower():
-            return "living room"
-        elif "speaker" in device_type.lower():
-            return "living room"
-        elif "light" in device_type.lower():
-            return "bedroom"
-        
-        return "unknown"
+        return _guess_room_impl(hostname.lower(), device_type.lower())
+
+    async def _get_session(self):
+        """Shared HTTP session, created lazily on the background loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self._timeouts["device"],
+                # Keep-alive lets repeated commands to a device reuse its connection
+                connector=aiohttp.TCPConnector(limit=64, limit_per_host=8, keepalive_timeout=30)
+            )
+        return self._session
+
+    async def _control_many(self, control, devices, command, value=None):
+        """Send the same command to several devices at once"""
+        return await asyncio.gather(*(control(device, command, value) for device in devices))
 
-    def _control_tv(self, ip, command, value=None):
+    async def _control_tv(self, ip, command, value=None):
         """Control smart TV"""
-        device = self.devices.get(ip, {})
-        tv_type = device.get("type", "").lower()
+        tv_type = self._match_field(ip, "type")
         
         print(f"📺 [SMART HOME]: Controlling {tv_type} at {ip}: {command}")
         
         # Roku TV control (most reliable)
         if "roku" in tv_type:
-            return self._control_roku_tv(ip, command, value)
+            return await self._control_roku_tv(ip, command, value)
         # Generic TV control attempts
         else:
-            return self._control_generic_device(ip, command, value, "tv")
+            return await self._control_generic_device(ip, command, value, "tv")
 
-    def _control_roku_tv(self, ip, command, value=None):
+    async def _control_roku_tv(self, ip, command, value=None):
         """Control Roku TV"""
         base_url = f"http://{ip}:8060/"
+        session = await self._get_session()
+        timeout = self._timeouts["tv"]
         
         roku_commands = {
             "power": "keypress/Power",
@@ -376,30 +590,30 @@ class SmartHome(Skill):
         if command in roku_commands:
             endpoint = roku_commands[command]
             try:
-                response = requests.post(f"{base_url}{endpoint}", timeout=3)
-                if response.status_code == 200:
-                    action = command.replace("power", "power ").title()
-                    return f"✅ TV: {action}"
-            except:
-                return f"❌ TV not responding"
+                async with session.post(f"{base_url}{endpoint}", timeout=timeout) as response:
+                    if response.status == 200:
+                        action = command.replace("power", "power ").title()
+                        return f"✅ TV: {action}"
+            except Exception:
+                return "❌ TV not responding"
         
         elif command == "app" and value:
             app_name = value.lower()
             if app_name in roku_commands:
                 endpoint = roku_commands[app_name]
                 try:
-                    response = requests.post(f"{base_url}{endpoint}", timeout=3)
-                    if response.status_code == 200:
-                        return f"✅ TV: Launched {value}"
-                except:
+                    async with session.post(f"{base_url}{endpoint}", timeout=timeout) as response:
+                        if response.status == 200:
+                            return f"✅ TV: Launched {value}"
+                except Exception:
                     return f"❌ Failed to launch {value}"
         
         return f"⚠️ TV command '{command}' not recognized"
 
-    def _control_lights(self, device_info, command, value=None):
+    async def _control_lights(self, device_info, command, value=None):
         """Control smart lights"""
         ip = device_info.get("ip")
-        device_type = device_info.get("type", "").lower()
+        device_type = self._match_field(ip, "type")
         
         print(f"💡 [SMART HOME]: Controlling lights at {ip}: {command}")
         
@@ -408,58 +622,69 @@ class SmartHome(Skill):
             try:
                 # Try to discover Hue bridge first
                 hue_url = f"http://{ip}/api/newdeveloper"  # Default Hue API
+                state = None
                 if command == "on":
-                    response = requests.put(f"{hue_url}/lights/1/state", 
-                                          json={"on": True}, timeout=2)
+                    state = {"on": True}
                 elif command == "off":
-                    response = requests.put(f"{hue_url}/lights/1/state", 
-                                          json={"on": False}, timeout=2)
+                    state = {"on": False}
                 elif command == "brightness" and value:
                     # Convert percentage to Hue brightness (0-254)
-                    brightness = int(int(value.replace('%', '')) * 2.54)
-                    response = requests.put(f"{hue_url}/lights/1/state", 
-                                          json={"bri": brightness}, timeout=2)
+                    state = {"bri": int(int(value.replace('%', '')) * 2.54)}
                 
-                if response and response.status_code in [200, 201]:
-                    return f"✅ Lights: {command.title()}"
-            except:
+                if state is not None:
+                    session = await self._get_session()
+                    async with session.put(f"{hue_url}/lights/1/state", json=state,
+                                           timeout=self._timeouts["light"]) as response:
+                        if response.status in [200, 201]:
+                            return f"✅ Lights: {command.title()}"
+            except Exception:
                 pass
         
         # Try generic light control
-        return self._control_generic_device(ip, command, value, "lights")
+        return await self._control_generic_device(ip, command, value, "lights")
 
-    def _control_plug(self, device_info, command, value=None):
+    async def _control_plug(self, device_info, command, value=None):
         """Control smart plug"""
         ip = device_info.get("ip")
         
         print(f"🔌 [SMART HOME]: Controlling plug at {ip}: {command}")
         
-        # Try Tasmota/TP-Link commands
-        endpoints = [
-            f"http://{ip}/cm?cmnd=Power%20On",
-            f"http://{ip}/cm?cmnd=Power%20Off",
-            f"http://{ip}/relay/0?turn=on",
-            f"http://{ip}/relay/0?turn=off",
-            f"http://{ip}/switch/0/on",
-            f"http://{ip}/switch/0/off"
-        ]
+        if command not in ("on", "off"):
+            return "⚠️ Could not control plug"
+        
+        session = await self._get_session()
         
-        for endpoint in endpoints:
+        async def attempt(firmware):
             try:
-                if command == "on" and "on" in endpoint.lower():
-                    response = requests.get(endpoint, timeout=2)
-                    if response.status_code == 200:
-                        return "✅ Plug: Turned ON"
-                elif command == "off" and "off" in endpoint.lower():
-                    response = requests.get(endpoint, timeout=2)
-                    if response.status_code == 200:
-                        return "✅ Plug: Turned OFF"
-            except:
-                continue
+                url = f"http://{ip}{_PLUG_ENDPOINTS[firmware][command]}"
+                async with session.get(url, timeout=self._timeouts["plug"]) as response:
+                    return firmware if response.status == 200 else None
+            except Exception:
+                return None
+        
+        # Known firmware: one request
+        known = device_info.get("_plug_endpoint")
+        if known in _PLUG_ENDPOINTS and await attempt(known):
+            return f"✅ Plug: Turned {command.upper()}"
+        
+        # Otherwise try Tasmota/Shelly/ESP endpoints at once; first 200 wins and is remembered
+        tasks = [asyncio.ensure_future(attempt(firmware)) for firmware in _PLUG_ENDPOINTS]
+        try:
+            for done in asyncio.as_completed(tasks):
+                firmware = await done
+                if firmware:
+                    if firmware != known:
+                        with self._state_lock:
+                            device_info["_plug_endpoint"] = firmware
+                        self._save_devices()
+                    return f"✅ Plug: Turned {command.upper()}"
+        finally:
+            for task in tasks:
+                task.cancel()
         
         return "⚠️ Could not control plug"
 
-    def _control_speaker(self, device_info, command, value=None):
+    async def _control_speaker(self, device_info, command, value=None):
         """Control smart speaker"""
         ip = device_info.get("ip")
         
@@ -471,16 +696,18 @@ class SmartHome(Skill):
                 volume = int(value.replace('%', ''))
                 # Normalize to 0-100
                 volume = max(0, min(100, volume))
-                response = requests.post(f"http://{ip}:8008/setup/set_volume", 
-                                       json={"volume": volume}, timeout=2)
-                if response.status_code == 200:
-                    return f"✅ Speaker: Volume {volume}%"
-        except:
+                session = await self._get_session()
+                async with session.post(f"http://{ip}:8008/setup/set_volume",
+                                        json={"volume": volume},
+                                        timeout=self._timeouts["speaker"]) as response:
+                    if response.status == 200:
+                        return f"✅ Speaker: Volume {volume}%"
+        except Exception:
             pass
         
         return f"⚠️ Speaker control for '{command}' not fully implemented"
 
-    def _control_generic_device(self, ip, command, value=None, device_type="device"):
+    async def _control_generic_device(self, ip, command, value=None, device_type="device"):
         """Try generic control methods"""
         # Try common smart home APIs
         endpoints = [
@@ -489,24 +716,38 @@ class SmartHome(Skill):
             (f"http://{ip}/cmd", "GET"),
             (f"http://{ip}/state", "PUT")
         ]
+        session = await self._get_session()
+        # "lights" -> light budget, "tv" -> tv budget, anything else -> default
+        timeout = self._timeouts.get(device_type.rstrip("s"), self._timeouts["device"])
         
         for url, method in endpoints:
             try:
-                if method == "POST":
-                    response = requests.post(url, json={"command": command, "value": value}, timeout=2)
-                elif method == "PUT":
-                    response = requests.put(url, json={"command": command, "value": value}, timeout=2)
-                else:
-                    response = requests.get(url, timeout=2)
-                
-                if response.status_code < 400:
-                    return f"✅ {device_type.title()}: {command.title()} sent"
-            except:
+                body = {"command": command, "value": value} if method != "GET" else None
+                async with session.request(method, url, json=body, timeout=timeout) as response:
+                    if response.status < 400:
+                        return f"✅ {device_type.title()}: {command.title()} sent"
+            except Exception:
                 continue
         
         return f"⚠️ Could not control {device_type}"
 
-    def _execute_scene(self, scene_name):
+    async def _dispatch_action(self, action, device_ip):
+        """Run a single scene action against a resolved device"""
+        device_name = action.get("device", "").lower()
+        action_cmd = action.get("action", "")
+        value = action.get("value", "")
+        
+        if "light" in device_name:
+            return await self._control_lights(self.devices[device_ip], action_cmd, value)
+        elif "tv" in device_name:
+            return await self._control_tv(device_ip, action_cmd, value)
+        elif "plug" in device_name:
+            return await self._control_plug(self.devices[device_ip], action_cmd, value)
+        elif "speaker" in device_name:
+            return await self._control_speaker(self.devices[device_ip], action_cmd, value)
+        return "⚠️ Device type not supported in scene"
+
+    async def _execute_scene(self, scene_name):
         """Execute a saved scene"""
         scene = self.scenes.get(scene_name.lower())
         if not scene:
@@ -514,37 +755,101 @@ class SmartHome(Skill):
         
         print(f"🎭 [SMART HOME]: Executing scene: {scene_name}")
         
-        results = []
+        # Group actions by target device: a device's actions stay in order
+        # ("tv on" before "tv app"), different devices run concurrently
+        groups = defaultdict(list)
         for action in scene.get("actions", []):
-            device_name = action.get("device", "")
-            action_cmd = action.get("action", "")
-            value = action.get("value", "")
-            
-            # Find device
-            device_ip = None
-            for ip, dev in self.devices.items():
-                if device_name.lower() in dev.get("type", "").lower() or \
-                   device_name.lower() in dev.get("hostname", "").lower():
-                    device_ip = ip
-                    break
-            
+            device_ip = self._find_scene_device(action.get("device", ""))
             if device_ip:
-                # Execute action
-                if "light" in device_name.lower():
-                    result = self._control_lights(self.devices[device_ip], action_cmd, value)
-                elif "tv" in device_name.lower():
-                    result = self._control_tv(device_ip, action_cmd, value)
-                elif "plug" in device_name.lower():
-                    result = self._control_plug(self.devices[device_ip], action_cmd, value)
-                elif "speaker" in device_name.lower():
-                    result = self._control_speaker(self.devices[device_ip], action_cmd, value)
-                else:
-                    result = f"⚠️ Device type not supported in scene"
-                
-                results.append(result)
+                groups[device_ip].append(action)
+        
+        async def run_group(device_ip, actions):
+            results = []
+            for action in actions:
+                try:
+                    results.append(await self._dispatch_action(action, device_ip))
+                except Exception as e:
+                    results.append(f"❌ {action.get('device', 'device')}: {e}")
+            return results
+        
+        grouped = await asyncio.gather(*(run_group(ip, actions) for ip, actions in groups.items()))
+        results = [result for group in grouped for result in group]
         
         return f"🎭 Scene '{scene_name}':\n" + "\n".join(results)
 
+    def cleanup(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            io_loop.run_async(self._session.close())
+
+    def _cmd_scan(self):
+        """Scan and summarize devices by room"""
+        devices = self._scan_network()
+        
+        if not devices:
+            return "❌ No smart devices found. Make sure devices are powered on."
+        
+        # Group preformatted rows by room
+        rooms = defaultdict(list)
+        for device in devices:
+            rooms[device.get("room", "unknown")].append(self._rows[device["ip"]][0])
+        
+        result = ["🏠 **Smart Home Overview**", "=" * 50]
+        
+        for room, rows in rooms.items():
+            result.append(f"\n📍 **{room.title()}:**")
+            result.extend(rows)
+        
+        result.append(f"\n📊 Total: {len(devices)} device(s) across {len(rooms)} room(s)")
+        result.append("\n💡 Try: 'living room on' or 'tv netflix'")
+        return "\n".join(result)
+
+    def _cmd_list_devices(self):
+        """List every known device (in IP order)"""
+        if not self.devices:
+            return "❌ No devices discovered yet. Use 'scan devices' first."
+        
+        header = "📋 **All Smart Devices:**\n" + "=" * 50
+        return "\n".join([header, *(self._rows[device["ip"]][1] for device in self._devs)])
+
+    def _cmd_list_scenes(self):
+        """List every scene with its description"""
+        result = ["🎭 **Available Scenes:**", "=" * 50]
+        for scene_name, scene_info in self.scenes.items():
+            result.append(f"• {scene_name.title()}: {scene_info.get('description', 'No description')}")
+        
+        return "\n".join(result)
+
+    def _cmd_help(self):
+        """Command reference"""
+        return """🏠 **Smart Home Commands:**
+
+**Discovery:**
+• scan devices - Find all smart devices
+• list devices - Show discovered devices
+• list scenes - Show available scenes
+
+**Room Control:**
+• living room on/off - Control entire room
+• bedroom on/off - Bedroom devices
+• kitchen on/off - Kitchen devices
+
+**Device Control:**
+• tv youtube/netflix/disney - Open apps on TV
+• tv volume up/down/mute - Control TV volume
+• lights on/off/dim 50% - Control smart lights
+• plug on/off - Control smart plugs
+
+**Scenes:**
+• movie night - Setup for movies
+• good morning - Wake up routine
+• good night - Bedtime routine
+• party mode - Entertainment setup
+
+**Advanced:**
+• create scene [name] - Create custom scene
+• list scenes - Show all scenes"""
+
     def run(self, parameters: dict):
         user_input = parameters.get("user_input", "").strip().lower()
         
@@ -553,209 +858,138 @@ class SmartHome(Skill):
         if not user_input:
             return "Smart Home ready. Try 'scan devices', 'tv youtube', or 'movie night'"
         
+        # Whole-command fast path: one hash lookup, no keyword scanning
+        handler = _EXACT_COMMANDS.get(user_input)
+        if handler:
+            return getattr(self, handler)()
+        
+        commands = {_COMMAND_GROUPS[m.group()] for m in _COMMAND_RE.finditer(user_input)}
+        
         # --- SCAN DEVICES ---
-        if any(cmd in user_input for cmd in ["scan", "discover", "find devices"]):
-            devices = self._scan_network()
-            
-            if not devices:
-                return "❌ No smart devices found. Make sure devices are powered on."
-            
-            # Group by room
-            rooms = {}
-            for device in devices:
-                room = device.get("room", "unknown")
-                if room not in rooms:
-                    rooms[room] = []
-                rooms[room].append(device)
-            
-            result = ["🏠 **Smart Home Overview**", "=" * 50]
-            
-            for room, room_devices in rooms.items():
-                result.append(f"\n📍 **{room.title()}:**")
-                for device in room_devices:
-                    result.append(f"  • {device['type']} ({device['ip']})")
-            
-            result.append(f"\n📊 Total: {len(devices)} device(s) across {len(rooms)} room(s)")
-            result.append("\n💡 Try: 'living room on' or 'tv netflix'")
-            return "\n".join(result)
+        if "scan" in commands:
+            return self._cmd_scan()
         
         # --- ROOM CONTROL ---
-        for room in self.rooms.keys():
-            if room in user_input:
-                if "on" in user_input:
-                    return f"✅ Turning on all devices in {room}"
-                elif "off" in user_input:
-                    return f"✅ Turning off all devices in {room}"
+        room_match = self._room_re.search(user_input)
+        if room_match:
+            room = room_match.group(1)
+            words = set(_WORD_RE.findall(user_input))
+            if "on" in words:
+                return f"✅ Turning on all devices in {room}"
+            elif "off" in words:
+                return f"✅ Turning off all devices in {room}"
+            else:
+                # List devices in room
+                room_devices = self._by_room.get(room, [])
+                if room_devices:
+                    result = [f"📍 **{room.title()} Devices:**", "=" * 40]
+                    for device in room_devices:
+                        result.append(f"• {device['type']} - Control with: '{device['type'].split()[0].lower()} on/off'")
+                    return "\n".join(result)
                 else:
-                    # List devices in room
-                    room_devices = [d for d in self.devices.values() 
-                                  if d.get("room", "").lower() == room]
-                    if room_devices:
-                        result = [f"📍 **{room.title()} Devices:**", "=" * 40]
-                        for device in room_devices:
-                            result.append(f"• {device['type']} - Control with: '{device['type'].split()[0].lower()} on/off'")
-                        return "\n".join(result)
-                    else:
-                        return f"❌ No devices found in {room}. Try 'scan devices' first."
+                    return f"❌ No devices found in {room}. Try 'scan devices' first."
         
         # --- TV CONTROL ---
-        if "tv" in user_input or "television" in user_input:
+        if "tv" in commands:
             # Find TV
-            tv_ip = None
-            for ip, device in self.devices.items():
-                if "tv" in device.get("type", "").lower():
-                    tv_ip = ip
-                    break
+            tvs = self._by_type.get("tv")
+            tv_ip = tvs[0]["ip"] if tvs else None
             
             if not tv_ip:
                 return "❌ No TV found. Use 'scan devices' first."
             
             # TV commands
             if "power on" in user_input or "turn on tv" in user_input:
-                return self._control_tv(tv_ip, "poweron")
+                return io_loop.run_async(self._control_tv(tv_ip, "poweron"))
             elif "power off" in user_input or "turn off tv" in user_input:
-                return self._control_tv(tv_ip, "poweroff")
+                return io_loop.run_async(self._control_tv(tv_ip, "poweroff"))
             elif "youtube" in user_input:
-                return self._control_tv(tv_ip, "app", "youtube")
+                return io_loop.run_async(self._control_tv(tv_ip, "app", "youtube"))
             elif "netflix" in user_input:
-                return self._control_tv(tv_ip, "app", "netflix")
+                return io_loop.run_async(self._control_tv(tv_ip, "app", "netflix"))
             elif "disney" in user_input:
-                return self._control_tv(tv_ip, "app", "disney")
+                return io_loop.run_async(self._control_tv(tv_ip, "app", "disney"))
             elif "amazon" in user_input or "prime" in user_input:
-                return self._control_tv(tv_ip, "app", "amazon")
+                return io_loop.run_async(self._control_tv(tv_ip, "app", "amazon"))
             elif "spotify" in user_input:
-                return self._control_tv(tv_ip, "app", "spotify")
+                return io_loop.run_async(self._control_tv(tv_ip, "app", "spotify"))
             elif "volume up" in user_input:
-                return self._control_tv(tv_ip, "volumeup")
+                return io_loop.run_async(self._control_tv(tv_ip, "volumeup"))
             elif "volume down" in user_input:
-                return self._control_tv(tv_ip, "volumedown")
+                return io_loop.run_async(self._control_tv(tv_ip, "volumedown"))
             elif "mute" in user_input:
-                return self._control_tv(tv_ip, "volumemute")
+                return io_loop.run_async(self._control_tv(tv_ip, "volumemute"))
             elif "home" in user_input:
-                return self._control_tv(tv_ip, "home")
+                return io_loop.run_async(self._control_tv(tv_ip, "home"))
             else:
-                return f"TV found. Try: 'tv youtube', 'tv netflix', 'tv volume up'"
+                return "TV found. Try: 'tv youtube', 'tv netflix', 'tv volume up'"
         
         # --- LIGHTS CONTROL ---
-        if "light" in user_input or "lights" in user_input or "lamp" in user_input:
+        if "lights" in commands:
             # Find lights
-            light_ips = [ip for ip, device in self.devices.items() 
-                        if "light" in device.get("type", "").lower()]
+            lights = self._by_type.get("lights", [])
             
-            if not light_ips:
+            if not lights:
                 return "❌ No smart lights found. Use 'scan devices' first."
             
             # Light commands
             if "on" in user_input:
-                results = []
-                for ip in light_ips:
-                    results.append(self._control_lights(self.devices[ip], "on"))
-                return "\n".join(results)
+                return "\n".join(io_loop.run_async(self._control_many(self._control_lights, lights, "on")))
             elif "off" in user_input:
-                results = []
-                for ip in light_ips:
-                    results.append(self._control_lights(self.devices[ip], "off"))
-                return "\n".join(results)
+                return "\n".join(io_loop.run_async(self._control_many(self._control_lights, lights, "off")))
             elif "bright" in user_input or "dim" in user_input:
                 # Extract percentage
-                import re
-                match = re.search(r'(\d+)%', user_input)
+                match = PCT_RE.search(user_input)
                 percentage = match.group(1) if match else "50"
-                results = []
-                for ip in light_ips:
-                    results.append(self._control_lights(self.devices[ip], "brightness", f"{percentage}%"))
-                return "\n".join(results)
+                return "\n".join(io_loop.run_async(self._control_many(self._control_lights, lights, "brightness", f"{percentage}%")))
             else:
-                return f"Found {len(light_ips)} light(s). Try: 'lights on', 'lights off', 'lights dim 50%'"
+                return f"Found {len(lights)} light(s). Try: 'lights on', 'lights off', 'lights dim 50%'"
         
         # --- PLUG CONTROL ---
-        if "plug" in user_input or "socket" in user_input or "outlet" in user_input:
+        if "plug" in commands:
             # Find plugs
-            plug_ips = [ip for ip, device in self.devices.items() 
-                       if "plug" in device.get("type", "").lower()]
+            plugs = self._by_type.get("plugs", [])
             
-            if not plug_ips:
+            if not plugs:
                 return "❌ No smart plugs found. Use 'scan devices' first."
             
             if "on" in user_input:
-                results = []
-                for ip in plug_ips:
-                    results.append(self._control_plug(self.devices[ip], "on"))
-                return "\n".join(results)
+                return "\n".join(io_loop.run_async(self._control_many(self._control_plug, plugs, "on")))
             elif "off" in user_input:
-                results = []
-                for ip in plug_ips:
-                    results.append(self._control_plug(self.devices[ip], "off"))
-                return "\n".join(results)
+                return "\n".join(io_loop.run_async(self._control_many(self._control_plug, plugs, "off")))
             else:
-                return f"Found {len(plug_ips)} plug(s). Try: 'plug on' or 'plug off'"
+                return f"Found {len(plugs)} plug(s). Try: 'plug on' or 'plug off'"
         
         # --- SCENES ---
-        for scene_name in self.scenes.keys():
-            if scene_name in user_input:
-                return self._execute_scene(scene_name)
+        scene_match = self._scene_re.search(user_input) if self._scene_re else None
+        if scene_match:
+            return io_loop.run_async(self._execute_scene(scene_match.group()))
         
         # Create new scene
-        if "create scene" in user_input or "save scene" in user_input:
+        if "create_scene" in commands:
             # Extract scene name
             scene_name = user_input.replace("create scene", "").replace("save scene", "").strip()
             if scene_name:
-                self.scenes[scene_name.lower()] = {
-                    "description": "Custom scene created by user",
-                    "actions": []
-                }
+                with self._state_lock:
+                    self.scenes[scene_name.lower()] = {
+                        "description": "Custom scene created by user",
+                        "actions": []
+                    }
                 self._save_scenes()
+                self._compile_scene_matcher()
                 return f"✅ Created scene '{scene_name}'. Add devices with 'add to scene {scene_name}'"
         
         # --- LIST DEVICES ---
-        if "list devices" in user_input or "show devices" in user_input:
-            if not self.devices:
-                return "❌ No devices discovered yet. Use 'scan devices' first."
-            
-            result = ["📋 **All Smart Devices:**", "=" * 50]
-            for ip, device in self.devices.items():
-                room = device.get("room", "unknown")
-                result.append(f"• {device['type']} at {ip} ({room})")
-            
-            return "\n".join(result)
+        if "list_devices" in commands:
+            return self._cmd_list_devices()
         
         # --- LIST SCENES ---
-        if "list scenes" in user_input or "show scenes" in user_input:
-            result = ["🎭 **Available Scenes:**", "=" * 50]
-            for scene_name, scene_info in self.scenes.items():
-                result.append(f"• {scene_name.title()}: {scene_info.get('description', 'No description')}")
-            
-            return "\n".join(result)
+        if "list_scenes" in commands:
+            return self._cmd_list_scenes()
         
         # --- HELP ---
-        if "help" in user_input:
-            return """🏠 **Smart Home Commands:**
-
-**Discovery:**
-• scan devices - Find all smart devices
-• list devices - Show discovered devices
-• list scenes - Show available scenes
-
-**Room Control:**
-• living room on/off - Control entire room
-• bedroom on/off - Bedroom devices
-• kitchen on/off - Kitchen devices
-
-**Device Control:**
-• tv youtube/netflix/disney - Open apps on TV
-• tv volume up/down/mute - Control TV volume
-• lights on/off/dim 50% - Control smart lights
-• plug on/off - Control smart plugs
-
-**Scenes:**
-• movie night - Setup for movies
-• good morning - Wake up routine
-• good night - Bedtime routine
-• party mode - Entertainment setup
-
-**Advanced:**
-• create scene [name] - Create custom scene
-• list scenes - Show all scenes"""
+        if "help" in commands:
+            return self._cmd_help()
         
         # --- DEFAULT ---
         return "I can control your smart home. Try 'scan devices' to get started or 'help' for commands."
@@ -1,23 +1,27 @@
-import requests
 import time
-import json
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlparse
 from skill_manager import Skill
+from core import background, fast_json
 import re
+import itertools
+import importlib.util
 
-# Conditional import for DuckDuckGo
-try:
-    from duckduckgo_search import DDGS
-    DDGS_AVAILABLE = True
-except ImportError:
+# DuckDuckGo is optional; check for it here but import it on first search
+DDGS_AVAILABLE = importlib.util.find_spec("duckduckgo_search") is not None
+if not DDGS_AVAILABLE:
     print("⚠️ [OSINT]: duckduckgo-search not installed. Install with: pip install duckduckgo-search")
-    DDGS_AVAILABLE = False
 
 @dataclass
 class SearchResult:
+    # Many of these are built per query; no per-instance __dict__
+    # (spelled out rather than slots=True, which needs Python 3.10)
+    __slots__ = ('name', 'source', 'url', 'description', 'confidence', 'timestamp')
+    
     name: str
     source: str
     url: str
@@ -38,12 +42,50 @@ class OSINTSkill(Skill):
     ]
 
     supported_intents = ["osint_investigator"]
+    
+    # Registrable domain -> display name
+    _SOURCE_MAP = {
+        'linkedin.com': 'LinkedIn',
+        'twitter.com': 'Twitter/X',
+        'x.com': 'Twitter/X',
+        'facebook.com': 'Facebook',
+        'instagram.com': 'Instagram',
+        'github.com': 'GitHub',
+        'wikipedia.org': 'Wikipedia',
+        'crunchbase.com': 'Crunchbase',
+        'angel.co': 'AngelList',
+        'indeed.com': 'Indeed',
+        'reddit.com': 'Reddit',
+        'youtube.com': 'YouTube',
+        'medium.com': 'Medium',
+        'stackoverflow.com': 'Stack Overflow',
+        'producthunt.com': 'Product Hunt'
+    }
+    _NEWS_DOMAINS = frozenset(['cnn.com', 'bbc.com', 'reuters.com', 'bloomberg.com', 'wsj.com', 'nytimes.com'])
+    
+    # Pattern types in the order _identify_query_type prefers them
+    _TYPE_PRIORITY = {"email": 0, "phone": 1, "username": 2, "domain": 3}
+    
+    # Command prefixes stripped from the query
+    _TRIGGERS = ("find ", "search for ", "look up ", "who is ", "investigate ",
+                 "background check on ", "osint on ", "research ", "information about ")
+    
+    # Report sections
+    _SOCIAL_SOURCES = frozenset(['LinkedIn', 'Twitter/X', 'Facebook', 'Instagram', 'GitHub'])
+    _WEB_SOURCES = frozenset(['Wikipedia', 'Crunchbase', 'News', 'Web'])
 
     def __init__(self):
         self.max_results = 10
         self.history_path = "core/osint_history.json"
         self.history = self._load_history()
         
+        # DuckDuckGo result cache: search query -> (fetched_at, raw results), LRU + TTL
+        self.cache_path = "core/osint_cache.json"
+        self._cache_ttl = 3600
+        self._cache_size = 256
+        self._ddg_cache = self._load_cache()
+        background.on_exit("osint.cache", self._save_cache)
+        
         # Common data sources
         self.data_sources = {
             "social_media": {
@@ -68,6 +110,12 @@ class OSINTSkill(Skill):
             }
         }
         
+        # (source name, URL template, description template) per social platform
+        self._social_links = tuple(
+            (platform.title(), url_template, f"Direct search link for {{}} on {platform}")
+            for platform, url_template in self.data_sources["social_media"].items()
+        )
+        
         # Search patterns
         self.search_patterns = {
             "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
@@ -75,6 +123,24 @@ class OSINTSkill(Skill):
             "username": r'@[\w\d_]+',
             "domain": r'\b(?:https?://)?(?:www\.)?([a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)+)\b'
         }
+        # All four in one alternation (listed in priority order) so a single
+        # scan classifies the query. Each branch is a lookahead, so a match of
+        # one type never consumes text that another type would have matched;
+        # domain is matched case-insensitively as before
+        p = self.search_patterns
+        self._combined_re = re.compile(
+            f"(?=(?P<email>{p['email']}))|(?=(?P<phone>{p['phone']}))|"
+            f"(?=(?P<username>{p['username']}))|(?i:(?=(?P<domain>{p['domain']})))"
+        )
+        self._domain_host_group = self._combined_re.groupindex["domain"] + 1
+        
+        # Character trie over the trigger prefixes ("find ", "who is ", ...)
+        self._trigger_trie = {}
+        for trigger in self._TRIGGERS:
+            node = self._trigger_trie
+            for ch in trigger:
+                node = node.setdefault(ch, {})
+            node[None] = len(trigger)
         
         print("✅ [OSINT]: Investigator initialized")
 
@@ -82,12 +148,49 @@ class OSINTSkill(Skill):
         """Load search history"""
         if os.path.exists(self.history_path):
             try:
-                with open(self.history_path, "r") as f:
-                    return json.load(f)
+                return fast_json.load_file(self.history_path)
             except:
                 pass
         return []
 
+    def _load_cache(self):
+        """Load unexpired DuckDuckGo results from the last session"""
+        cache = OrderedDict()
+        if os.path.exists(self.cache_path):
+            try:
+                now = time.time()
+                for search_query, (fetched_at, hits) in fast_json.load_file(self.cache_path).items():
+                    if now - fetched_at < self._cache_ttl:
+                        cache[search_query] = (fetched_at, hits)
+            except:
+                pass
+        return cache
+
+    def _save_cache(self):
+        """Persist the DuckDuckGo cache (runs at exit)"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            fast_json.dump_file_atomic(self.cache_path, dict(self._ddg_cache))
+        except Exception as e:
+            print(f"⚠️ [OSINT]: Could not save search cache: {e}")
+
+    def _cached_ddg_text(self, search_query: str):
+        """Cached DuckDuckGo hits for a query, or None if missing/expired"""
+        entry = self._ddg_cache.get(search_query)
+        if entry is None:
+            return None
+        if time.time() - entry[0] >= self._cache_ttl:
+            del self._ddg_cache[search_query]
+            return None
+        self._ddg_cache.move_to_end(search_query)
+        return entry[1]
+
+    def _store_ddg_text(self, search_query: str, hits: list):
+        self._ddg_cache[search_query] = (time.time(), hits)
+        self._ddg_cache.move_to_end(search_query)
+        while len(self._ddg_cache) > self._cache_size:
+            self._ddg_cache.popitem(last=False)
+
     def _save_history(self, query: str, results: List[SearchResult]):
         """Save search to history"""
         try:
@@ -103,35 +206,39 @@ class OSINTSkill(Skill):
             if len(self.history) > 50:
                 self.history = self.history[-50:]
             
-            os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
-            with open(self.history_path, "w") as f:
-                json.dump(self.history, f, indent=2)
+            # Written by the shared background writer; a burst costs one write
+            background.schedule_write(self.history_path, list(self.history), indent=True)
         except:
             pass
 
+    def _trigger_length(self, text: str) -> int:
+        """Length of the longest trigger prefix of text (0 if none)"""
+        node = self._trigger_trie
+        matched = 0
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            matched = node.get(None, matched)
+        return matched
+
     def _identify_query_type(self, query: str) -> Dict[str, str]:
         """Identify what type of information is being searched"""
         query_lower = query.lower()
         
-        # Check for email
-        email_match = re.search(self.search_patterns["email"], query)
-        if email_match:
-            return {"type": "email", "value": email_match.group()}
-        
-        # Check for phone
-        phone_match = re.search(self.search_patterns["phone"], query)
-        if phone_match:
-            return {"type": "phone", "value": phone_match.group()}
-        
-        # Check for username
-        username_match = re.search(self.search_patterns["username"], query)
-        if username_match:
-            return {"type": "username", "value": username_match.group()}
-        
-        # Check for domain/website
-        domain_match = re.search(self.search_patterns["domain"], query_lower)
-        if domain_match:
-            return {"type": "domain", "value": domain_match.group(1)}
+        # One scan; keep the first match of the highest-priority type
+        best = None
+        for match in self._combined_re.finditer(query):
+            kind = match.lastgroup
+            if best is None or self._TYPE_PRIORITY[kind] < self._TYPE_PRIORITY[best.lastgroup]:
+                best = match
+            if kind == "email":
+                break
+        if best is not None:
+            kind = best.lastgroup
+            if kind == "domain":
+                return {"type": "domain", "value": best.group(self._domain_host_group).lower()}
+            return {"type": kind, "value": best.group(kind)}
         
         # Check for person name
         name_words = query.split()
@@ -146,8 +253,11 @@ class OSINTSkill(Skill):
         # Default to general search
         return {"type": "general", "value": query}
 
-    def _search_duckduckgo(self, query: str, query_type: str) -> List[SearchResult]:
-        """Search using DuckDuckGo"""
+    def _search_duckduckgo(self, query: str, query_type: str,
+                           seen_urls: Optional[set] = None) -> List[SearchResult]:
+        """Search using DuckDuckGo (up to max_results, skipping URLs already in seen_urls)"""
+        if seen_urls is None:
+            seen_urls = set()
         if not DDGS_AVAILABLE:
             return []
         
@@ -180,21 +290,43 @@ class OSINTSkill(Skill):
             else:
                 search_queries = [query]
             
-            with DDGS() as ddgs:
-                for search_query in search_queries[:3]:  # Limit to 3 queries
-                    for r in ddgs.text(search_query, max_results=5):
-                        source = self._extract_source(r.get('href', ''))
-                        results.append(SearchResult(
-                            name=query,
-                            source=source,
-                            url=r.get('href', ''),
-                            description=r.get('body', 'No description available'),
-                            confidence=0.7 if query_type == "person" else 0.6,
-                            timestamp=time.strftime("%Y-%m-%d %H:%M:%S")
-                        ))
-                    
-                    # Add small delay between queries
-                    time.sleep(0.5)
+            search_queries = search_queries[:3]  # Limit to 3 queries
+            hits_by_query = {q: self._cached_ddg_text(q) for q in search_queries}
+            
+            # Fetch the uncached sub-queries concurrently
+            missing = [q for q, hits in hits_by_query.items() if hits is None]
+            if missing:
+                with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                    futures = {pool.submit(self._fetch_ddg_text, q): q for q in missing}
+                    for future in as_completed(futures):
+                        search_query = futures[future]
+                        try:
+                            hits = future.result()
+                            self._store_ddg_text(search_query, hits)
+                        except Exception as e:
+                            print(f"⚠️ [OSINT]: DuckDuckGo query '{search_query}' failed: {e}")
+                            hits = []
+                        hits_by_query[search_query] = hits
+            
+            # Merge in query order so ranking matches the old serial loop,
+            # stopping once max_results unique hits are collected
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            for search_query in search_queries:
+                for r in hits_by_query[search_query]:
+                    if len(results) >= self.max_results:
+                        break
+                    url = r.get('href', '')
+                    if url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                    results.append(SearchResult(
+                        name=query,
+                        source=self._extract_source(url),
+                        url=url,
+                        description=r.get('body', 'No description available'),
+                        confidence=0.7 if query_type == "person" else 0.6,
+                        timestamp=timestamp
+                    ))
             
             return results
             
@@ -202,151 +334,152 @@ class OSINTSkill(Skill):
             print(f"⚠️ [OSINT]: DuckDuckGo search failed: {e}")
             return []
 
+    def _fetch_ddg_text(self, search_query: str) -> list:
+        """One DuckDuckGo text search (own client per thread)"""
+        from duckduckgo_search import DDGS
+        with DDGS() as ddgs:
+            return list(ddgs.text(search_query, max_results=5))
+
     def _extract_source(self, url: str) -> str:
         """Extract source name from URL"""
-        url_lower = url.lower()
+        host = urlparse(url).hostname or ""
+        # Registrable domain: en.wikipedia.org -> wikipedia.org
+        domain = ".".join(host.split(".")[-2:])
         
-        source_map = {
-            'linkedin.com': 'LinkedIn',
-            'twitter.com': 'Twitter/X',
-            'x.com': 'Twitter/X',
-            'facebook.com': 'Facebook',
-            'instagram.com': 'Instagram',
-            'github.com': 'GitHub',
-            'wikipedia.org': 'Wikipedia',
-            'crunchbase.com': 'Crunchbase',
-            'angel.co': 'AngelList',
-            'indeed.com': 'Indeed',
-            'reddit.com': 'Reddit',
-            'youtube.com': 'YouTube',
-            'medium.com': 'Medium',
-            'stackoverflow.com': 'Stack Overflow',
-            'producthunt.com': 'Product Hunt'
-        }
-        
-        for domain, name in source_map.items():
-            if domain in url_lower:
-                return name
+        name = self._SOURCE_MAP.get(domain)
+        if name:
+            return name
         
         # Check for news sites
-        news_domains = ['cnn.com', 'bbc.com', 'reuters.com', 'bloomberg.com', 'wsj.com', 'nytimes.com']
-        for domain in news_domains:
-            if domain in url_lower:
-                return 'News'
+        if domain in self._NEWS_DOMAINS:
+            return 'News'
         
         return 'Web'
 
-    def _generate_direct_links(self, query: str, query_type: str) -> List[SearchResult]:
+    def _generate_direct_links(self, query: str, query_type: str,
+                               seen_urls: Optional[set] = None) -> List[SearchResult]:
         """Generate direct search links for various platforms"""
+        if seen_urls is None:
+            seen_urls = set()
         results = []
+        encoded_query = quote_plus(query)
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         
         # Social media links
-        for platform, url_template in self.data_sources["social_media"].items():
-            encoded_query = quote_plus(query)
+        for source, url_template, description in self._social_links:
             url = url_template.format(encoded_query)
+            if url in seen_urls:
+                continue
+            seen_urls.add(url)
             
             results.append(SearchResult(
                 name=query,
-                source=platform.title(),
+                source=source,
                 url=url,
-                description=f"Direct search link for {query} on {platform}",
+                description=description.format(query),
                 confidence=0.5,
-                timestamp=time.strftime("%Y-%m-%d %H:%M:%S")
+                timestamp=timestamp
             ))
         
         return results
 
+    # Next-step hints per query type; anything else gets the generic set
+    _NEXT_STEPS = {
+        "person": ("• Check public records in their location",
+                   "• Look for professional publications or patents",
+                   "• Search for associated companies or projects"),
+        "company": ("• Check SEC filings for public companies",
+                    "• Look for news articles about funding or acquisitions",
+                    "• Search for employee reviews on Glassdoor"),
+        "email": ("• Check Have I Been Pwned for breaches",
+                  "• Search for associated usernames",
+                  "• Look for domain registration information"),
+    }
+    _DEFAULT_NEXT_STEPS = ("• Try more specific search terms",
+                           "• Include dates or locations if relevant",
+                           "• Check multiple search engines")
+    _NO_RESULTS = ("❌ No public information found.",
+                   "",
+                   "💡 **Suggestions:**",
+                   "• Try different search terms",
+                   "• Include location or additional identifiers",
+                   "• Check privacy settings on social media")
+    _DISCLAIMER = ("",
+                   "⚠️ **Disclaimer:** This is public information only.",
+                   "   Respect privacy and follow legal guidelines.")
+    _CONFIDENCE_ICONS = ("🟡", "🟢")
+
+    def _report_header(self, query_type: str, query_value: str):
+        yield "🔍 **OSINT Investigation Report**"
+        yield "=" * 60
+        yield f"**Target:** {query_value}"
+        yield f"**Type:** {query_type.title()}"
+        yield f"**Timestamp:** {time.strftime('%Y-%m-%d %H:%M:%S')}"
+        yield ""
+
+    def _report_results(self, title: str, results: List[SearchResult], with_icon: bool):
+        if not results:
+            return
+        yield title
+        icons = self._CONFIDENCE_ICONS
+        for result in results[:5]:  # Top 5 per section
+            if with_icon:
+                yield f"• **{result.source}** {icons[result.confidence > 0.6]}"
+            else:
+                yield f"• **{result.source}**"
+            yield f"  {result.url}"
+            if len(result.description) > 100:
+                yield f"  *{result.description[:100]}...*"
+            yield ""
+
+    def _report_direct_links(self, direct_links: List[SearchResult]):
+        # First link per platform, top 6 platforms
+        first = {}
+        for r in direct_links:
+            first.setdefault(r.source, r.url)
+        yield "🔗 **Search Directly On:**"
+        for platform, url in list(first.items())[:6]:
+            yield f"• **{platform}**: {url}"
+        yield ""
+
+    def _report_summary(self, total: int, social: int, web: int):
+        yield "📊 **Summary:**"
+        yield f"• Total sources checked: {total}"
+        yield f"• Social media profiles found: {social}"
+        yield f"• Web references found: {web}"
+        yield ""
+
     def _format_results(self, query: str, query_info: Dict, results: List[SearchResult]) -> str:
         """Format OSINT results"""
         query_type = query_info["type"]
-        query_value = query_info["value"]
-        
-        output = []
-        
-        # Header
-        output.append(f"🔍 **OSINT Investigation Report**")
-        output.append("=" * 60)
-        output.append(f"**Target:** {query_value}")
-        output.append(f"**Type:** {query_type.title()}")
-        output.append(f"**Timestamp:** {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append("")
+        header = self._report_header(query_type, query_info["value"])
         
         if not results:
-            output.append("❌ No public information found.")
-            output.append("")
-            output.append("💡 **Suggestions:**")
-            output.append("• Try different search terms")
-            output.append("• Include location or additional identifiers")
-            output.append("• Check privacy settings on social media")
-            return "\n".join(output)
-        
-        # Group results by source type
-        social_results = [r for r in results if r.source in ['LinkedIn', 'Twitter/X', 'Facebook', 'Instagram', 'GitHub']]
-        web_results = [r for r in results if r.source in ['Wikipedia', 'Crunchbase', 'News', 'Web']]
-        direct_links = [r for r in results if r.confidence <= 0.5]
-        
-        # Social Media Findings
-        if social_results:
-            output.append("📱 **Social Media Profiles:**")
-            for result in social_results[:5]:  # Top 5 social results
-                confidence_icon = "🟢" if result.confidence > 0.6 else "🟡"
-                output.append(f"• **{result.source}** {confidence_icon}")
-                output.append(f"  {result.url}")
-                if len(result.description) > 100:
-                    output.append(f"  *{result.description[:100]}...*")
-                output.append("")
-        
-        # Web/News Findings
-        if web_results:
-            output.append("🌐 **Web/News References:**")
-            for result in web_results[:5]:  # Top 5 web results
-                output.append(f"• **{result.source}**")
-                output.append(f"  {result.url}")
-                if len(result.description) > 100:
-                    output.append(f"  *{result.description[:100]}...*")
-                output.append("")
-        
-        # Direct Search Links
-        if direct_links and (not social_results and not web_results):
-            output.append("🔗 **Search Directly On:**")
-            platforms = list(set(r.source for r in direct_links))
-            for platform in platforms[:6]:  # Top 6 platforms
-                platform_results = [r for r in direct_links if r.source == platform]
-                if platform_results:
-                    output.append(f"• **{platform}**: {platform_results[0].url}")
-            output.append("")
-        
-        # Statistics
-        output.append("📊 **Summary:**")
-        output.append(f"• Total sources checked: {len(results)}")
-        output.append(f"• Social media profiles found: {len(social_results)}")
-        output.append(f"• Web references found: {len(web_results)}")
-        output.append("")
-        
-        # Recommendations based on query type
-        output.append("💡 **Next Steps:**")
-        if query_type == "person":
-            output.append("• Check public records in their location")
-            output.append("• Look for professional publications or patents")
-            output.append("• Search for associated companies or projects")
-        elif query_type == "company":
-            output.append("• Check SEC filings for public companies")
-            output.append("• Look for news articles about funding or acquisitions")
-            output.append("• Search for employee reviews on Glassdoor")
-        elif query_type == "email":
-            output.append("• Check Have I Been Pwned for breaches")
-            output.append("• Search for associated usernames")
-            output.append("• Look for domain registration information")
-        else:
-            output.append("• Try more specific search terms")
-            output.append("• Include dates or locations if relevant")
-            output.append("• Check multiple search engines")
-        
-        output.append("")
-        output.append("⚠️ **Disclaimer:** This is public information only.")
-        output.append("   Respect privacy and follow legal guidelines.")
-        
-        return "\n".join(output)
+            return "\n".join(itertools.chain(header, self._NO_RESULTS))
+        
+        # Group results by source type in one pass
+        social_results, web_results, direct_links = [], [], []
+        for r in results:
+            if r.source in self._SOCIAL_SOURCES:
+                social_results.append(r)
+            elif r.source in self._WEB_SOURCES:
+                web_results.append(r)
+            if r.confidence <= 0.5:
+                direct_links.append(r)
+        
+        sections = [
+            header,
+            self._report_results("📱 **Social Media Profiles:**", social_results, True),
+            self._report_results("🌐 **Web/News References:**", web_results, False),
+        ]
+        if direct_links and not social_results and not web_results:
+            sections.append(self._report_direct_links(direct_links))
+        sections.append(self._report_summary(len(results), len(social_results), len(web_results)))
+        sections.append(("💡 **Next Steps:**",))
+        sections.append(self._NEXT_STEPS.get(query_type, self._DEFAULT_NEXT_STEPS))
+        sections.append(self._DISCLAIMER)
+        
+        return "\n".join(itertools.chain.from_iterable(sections))
 
     def run(self, parameters: Dict[str, Any]) -> str:
         user_input = parameters.get("user_input", "").strip()
@@ -356,15 +489,11 @@ class OSINTSkill(Skill):
         if not user_input:
             return "I need something to search for. Try: 'find John Smith' or 'search for Tesla Inc'"
         
-        # Clean the query
-        triggers = ["find ", "search for ", "look up ", "who is ", "investigate ", 
-                   "background check on ", "osint on ", "research ", "information about "]
-        
+        # Clean the query: strip the longest trigger prefix in one trie walk
         query = user_input.lower()
-        for trigger in triggers:
-            if query.startswith(trigger):
-                query = user_input[len(trigger):].strip()
-                break
+        trigger_len = self._trigger_length(query)
+        if trigger_len:
+            query = user_input[trigger_len:].strip()
         
         if not query or len(query) < 2:
             return "Please provide a proper search term (at least 2 characters)."
@@ -373,25 +502,16 @@ class OSINTSkill(Skill):
         query_info = self._identify_query_type(query)
         print(f"🔍 [OSINT]: Query type: {query_info['type']}, Value: {query_info['value']}")
         
-        # Perform searches
-        all_results = []
+        # Perform searches (producers skip URLs already seen)
+        unique_results = []
+        seen_urls = set()
         
         # Use DuckDuckGo if available
         if DDGS_AVAILABLE:
-            ddg_results = self._search_duckduckgo(query_info["value"], query_info["type"])
-            all_results.extend(ddg_results)
+            unique_results.extend(self._search_duckduckgo(query_info["value"], query_info["type"], seen_urls))
         
         # Generate direct links as fallback
-        direct_results = self._generate_direct_links(query_info["value"], query_info["type"])
-        all_results.extend(direct_results)
-        
-        # Remove duplicates (by URL)
-        unique_results = []
-        seen_urls = set()
-        for result in all_results:
-            if result.url not in seen_urls:
-                seen_urls.add(result.url)
-                unique_results.append(result)
+        unique_results.extend(self._generate_direct_links(query_info["value"], query_info["type"], seen_urls))
         
         # Save to history
         self._save_history(query, unique_results)
@@ -1,16 +1,26 @@
 from skill_manager import Skill
 import psutil # You may need to: pip install psutil
+from core import system_stats
 
 class SystemSentinel(Skill):
     name = "System Sentinel"
     description = "Checks hardware health and self-awareness"
     keywords = ["status", "how are you", "system", "health", "battery"]
     supported_intents = ["system_sentinel"]
+    def __init__(self):
+        # Refresh one hardware snapshot in the background so run() never
+        # blocks on a CPU sample or repeated /proc / WMI queries
+        system_stats.start()
+
     def run(self, parameters: dict):
         # 1. Gather Hardware Data
-        cpu_usage = psutil.cpu_percent(interval=1)
-        ram_usage = psutil.virtual_memory().percent
-        battery = psutil.sensors_battery()
+        snapshot = system_stats.snapshot()
+        cpu_usage = snapshot["cpu"]
+        if cpu_usage is None:
+            # Background sample not in yet: non-blocking reading since the priming call
+            cpu_usage = psutil.cpu_percent(interval=None)
+        ram_usage = snapshot["ram"]
+        battery = snapshot["batt"]
         batt_percent = battery.percent if battery else "Unknown"
         
         # 2. Self-Aware Logic (The "Mood" of Crystal)
@@ -21,4 +31,4 @@ class SystemSentinel(Skill):
         else:
             status = f"I'm feeling great! Everything is running smoothly. CPU is at {cpu_usage}% and RAM is at {ram_usage}%."
 
-        return status
\ No newline at end of file
+        return status
@@ -1,8 +1,6 @@
 import datetime
-import requests
-import pytz
-from timezonefinder import TimezoneFinder
 from skill_manager import Skill
+from core import geo
 
 class TimeSkill(Skill):
     name = "Clock"
@@ -10,36 +8,55 @@ class TimeSkill(Skill):
     keywords = ["time", "clock", "hour", "timezone"]
     supported_intents = ["time_skill"]
     def __init__(self):
-        self.tf = TimezoneFinder()
-        self.local_tz_name = self._detect_local_timezone()
+        # pytz and timezonefinder (which loads its polygon data on import) are
+        # only pulled in the first time someone actually asks for the time
+        self.tf = None
+        self.local_tz_name = None
+        self._city_index = None
+
+    def _get_city_index(self):
+        """"new york" -> "America/New_York" (first zone wins, as the old scan did)"""
+        if self._city_index is None:
+            import pytz
+            index = {}
+            for zone in pytz.all_timezones:
+                for segment in zone.split("/"):
+                    index.setdefault(segment.replace("_", " ").lower(), zone)
+            self._city_index = index
+        return self._city_index
 
     def _detect_local_timezone(self):
         """Uses IP to find coordinates, then finds the timezone name."""
         try:
             # Re-using the logic from your Weather Sentinel
-            res = requests.get('https://ipapi.co/json/', timeout=5).json()
+            res = geo.get_geo()
             lat, lon = res.get("latitude"), res.get("longitude")
             
             if lat and lon:
+                if self.tf is None:
+                    from timezonefinder import TimezoneFinder
+                    self.tf = TimezoneFinder()
                 return self.tf.timezone_at(lng=lon, lat=lat)
         except:
             pass
         return "Africa/Nairobi"  # Smart default
 
     def run(self, parameters: dict):
+        import pytz
         text = parameters.get("user_input", "").lower()
         
         # 🌐 Global Query Logic
         if "in" in text:
             target = text.split("in")[-1].strip().replace("?", "").title()
-            # Scan pytz for a matching city
-            for zone in pytz.all_timezones:
-                if target.replace(" ", "_") in zone:
-                    tz = pytz.timezone(zone)
-                    now = datetime.datetime.now(tz).strftime("%I:%M %p")
-                    return f"In {target}, it is currently {now}."
+            zone = self._get_city_index().get(target.lower())
+            if zone:
+                tz = pytz.timezone(zone)
+                now = datetime.datetime.now(tz).strftime("%I:%M %p")
+                return f"In {target}, it is currently {now}."
 
         # 🏠 Local Awareness Logic
+        if self.local_tz_name is None:
+            self.local_tz_name = self._detect_local_timezone()
         tz = pytz.timezone(self.local_tz_name)
         now = datetime.datetime.now(tz).strftime("%I:%M %p")
         return f"It's {now} here in our current location."
\ No newline at end of file
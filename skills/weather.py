@@ -3,6 +3,7 @@ import requests
 import time
 from dotenv import load_dotenv
 from skill_manager import Skill
+from core import fast_json, geo
 
 # 🔐 Load the secret vault
 load_dotenv()
@@ -20,6 +21,10 @@ class WeatherSentinel(Skill):
         self.last_check_time = 0
         self.check_interval = 1800  # 30 minutes
         self.last_condition = None
+        
+        # Persistent session: the 30-minute poll reuses the pooled connection
+        self._session = requests.Session()
+        self._session.headers.update({"User-Agent": "crystal/1.0"})
 
         if not self.api_key:
             print("⚠️ [WEATHER]: No API key found in .env!")
@@ -31,13 +36,20 @@ class WeatherSentinel(Skill):
         """Finds where the device is currently hosted."""
         try:
             # Using ipapi for a quick, keyless location grab
-            geo_res = requests.get('https://ipapi.co/json/', timeout=5).json()
+            geo_res = geo.get_geo()
             self.city = geo_res.get("city", "Nairobi") # Fallback to Nairobi if fails
             self.lat = geo_res.get("latitude")
             self.lon = geo_res.get("longitude")
             print(f"📍 [LOCATION]: Crystal has localized to {self.city}.")
         except:
             print("⚠️ [LOCATION]: Could not detect movement, staying at last known city.")
+        
+        # The endpoint only changes with the location, so build it here once
+        # Use Lat/Lon if available for pinpoint accuracy, else use City name
+        if self.lat and self.lon:
+            self._weather_url = f"http://api.openweathermap.org/data/2.5/weather?lat={self.lat}&lon={self.lon}&appid={self.api_key}&units=metric"
+        else:
+            self._weather_url = f"http://api.openweathermap.org/data/2.5/weather?q={self.city}&appid={self.api_key}&units=metric"
 
     def weather_monitor(self):
         """Background loop called by CrystalBrain."""
@@ -46,14 +58,8 @@ class WeatherSentinel(Skill):
             return
 
         try:
-            # Use Lat/Lon if available for pinpoint accuracy, else use City name
-            if self.lat and self.lon:
-                url = f"http://api.openweathermap.org/data/2.5/weather?lat={self.lat}&lon={self.lon}&appid={self.api_key}&units=metric"
-            else:
-                url = f"http://api.openweathermap.org/data/2.5/weather?q={self.city}&appid={self.api_key}&units=metric"
-            
-            response = requests.get(url, timeout=10)
-            data = response.json()
+            response = self._session.get(self._weather_url, timeout=10)
+            data = fast_json.loads(response.content)
 
             if response.status_code == 200:
                 condition = data['weather'][0]['main']
@@ -1,28 +1,107 @@
 # super_bridge_server.py
-from flask import Flask, request, jsonify
+from flask import Flask, request, Response, abort
 from flask_cors import CORS
 import requests
-import json
-import os
+from requests.adapters import HTTPAdapter
 import threading
 import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime
+from types import MappingProxyType
 import logging
-from typing import Dict, List, Any
+import re
+from typing import Dict
 import socket
 
+from core import fast_json
+
+# Production WSGI server (pure Python, runs on Windows); dev server otherwise
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+# Replies to these depend on the clock or the conversation, never reuse them
+_UNCACHEABLE_RE = re.compile(
+    r"\b(time|date|today|tonight|tomorrow|yesterday|now|weather|news|latest|"
+    r"this|that|it|more|again|yes|no|continue)\b"
+)
+_AI_CACHE_MIN_WORDS = 4  # short replies ("ok", "tell me more") lean on context
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _json_response(data, status=200):
+    """jsonify() through fast_json (orjson when installed)"""
+    return Response(fast_json.dumps(data), status=status, mimetype='application/json')
+
+
+def _request_json():
+    """request.json through fast_json; 400 on a malformed body"""
+    try:
+        return fast_json.loads(request.get_data(cache=False))
+    except ValueError:
+        abort(400)
+
 class SuperCrystalBridge:
+    # Canned replies when Crystal AI is unavailable, first keyword match wins;
+    # time/date are callables so the clock is only formatted when used
+    _FALLBACKS = (
+        ("hello", "Hello! Your Android clone is connected to Crystal Bridge."),
+        ("what can you do", "I can help control your Android device: play music, make calls, send messages, control settings, and much more!"),
+        ("time", lambda: f"The time is {datetime.now().strftime('%I:%M %p')}"),
+        ("date", lambda: f"Today is {datetime.now().strftime('%A, %B %d, %Y')}"),
+        ("battery", "You can check battery in device settings or ask me to check it for you."),
+        ("weather", "I can fetch weather info through the main Crystal AI when connected."),
+        ("thank", "You're welcome! I'm here to help with your Android device.")
+    )
+    
     def __init__(self):
         self.app = Flask(__name__)
         CORS(self.app)
         self.setup_routes()
         
         self.connected_devices = {}
+        # Writers (register, process, cleanup) hold the lock; adding or
+        # removing a device republishes a read-only copy that readers iterate
+        # without locking (last-seen is updated in place on the shared dicts)
+        self._devices_lock = threading.RLock()
+        self._devices_view = MappingProxyType({})
+        # device_id -> monotonic last-seen, oldest first, so cleanup only
+        # looks at devices that have actually expired
+        self._last_seen_order = OrderedDict()
+        self.device_timeout = 900  # 15 minutes
+        self._cleanup_started = False
         self.skill_responses = {}
         self.crystal_endpoint = "http://localhost:8000"  # Your Crystal AI
+        # (connect, read) for the Crystal AI call itself. The call runs on
+        # _ai_pool; /process normally waits for it, async callers wait at
+        # most ai_wait seconds and then get a job id (see /process)
+        self.crystal_timeout = (3, 30)
+        self.ai_wait = 2.0
+        self._ai_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="crystal-ai")
+        self._ai_jobs = OrderedDict()  # job id -> Future, oldest first
+        self._ai_jobs_lock = threading.Lock()
+        self._ai_jobs_size = 1024
+        # Keep-alive pool to Crystal AI, sized for the threaded server
+        self._session = requests.Session()
+        self._session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=64))
+        
+        # Recent Crystal AI replies by (device id, normalized message), only
+        # for self-contained messages (see _ai_cacheable)
+        self._ai_cache = OrderedDict()
+        self._ai_cache_lock = threading.Lock()
+        self._ai_cache_ttl = 300  # 5 minutes
+        self._ai_cache_size = 4096
+        
+        # Encoded /process replies for category commands (never AI replies)
+        self._hot_cache = OrderedDict()
+        self._hot_lock = threading.Lock()
+        self._hot_cache_size = 2048
         
         # Skill mappings
         self.skill_categories = {
@@ -37,160 +116,282 @@ class SuperCrystalBridge:
             'security': ['lock', 'unlock', 'password', 'secure'],
             'system': ['info', 'status', 'storage', 'memory']
         }
+        self._build_keyword_index()
+        
+        # /skills never changes; /devices is re-encoded only when a device
+        # changes or an active device is about to go inactive
+        self._skills_body = fast_json.dumps({
+            'categories': self.skill_categories,
+            'total_categories': len(self.skill_categories),
+            'description': 'Available skill categories for Android devices'
+        })
+        self._devices_cache = None  # (devices view, generation, body, valid until)
+        # Bumped by _touch when a device goes inactive -> active; a /devices
+        # body built before the bump is never served after it
+        self._devices_gen = 0
         
         logger.info("Super Crystal Bridge initialized")
     
     def setup_routes(self):
         @self.app.route('/ping', methods=['GET'])
         def ping():
-            return jsonify({
+            return _json_response({
                 'status': 'online',
                 'service': 'Super Crystal Bridge',
                 'time': datetime.now().isoformat(),
-                'devices': len(self.connected_devices),
+                'devices': len(self._devices_view),
                 'version': '2.0'
             })
         
         @self.app.route('/register', methods=['POST'])
         def register_device():
-            data = request.json
+            data = _request_json()
             device_id = data.get('device_id')
             
             if not device_id:
-                return jsonify({'error': 'Device ID required'}), 400
+                return _json_response({'error': 'Device ID required'}, 400)
             
             device_info = {
                 'capabilities': data.get('capabilities', {}),
-                'last_seen': datetime.now(),
                 'name': data.get('name', 'Android Device'),
                 'type': 'android',
                 'ip': request.remote_addr,
                 'skills': data.get('capabilities', {}).get('skills', []),
                 'registered_at': datetime.now().isoformat()
             }
+            device_info['_flags'] = self._skill_flags(device_info['capabilities'])
+            device_info['_ai_template'] = self._ai_template(device_id, device_info)
             
-            self.connected_devices[device_id] = device_info
+            with self._devices_lock:
+                self._touch(device_id, device_info)
+                self.connected_devices[device_id] = device_info
+                self._publish_devices()
             logger.info(f"Device registered: {device_id} with {len(device_info['skills'])} skills")
             
-            return jsonify({
+            return _json_response({
                 'status': 'registered',
                 'device_id': device_id,
                 'message': 'Welcome to Crystal Network',
                 'available_skills': list(self.skill_categories.keys())
             })
         
+        # POST /process answers 200 with the reply. A client that sends
+        # "async": true (or a "Prefer: respond-async" header) gets 202 with
+        # a job_id instead when Crystal AI takes longer than ai_wait, and
+        # polls GET /result/<job_id>: 202 while pending, 200 with the same
+        # body as /process once done, 404 after that (or for unknown ids).
         @self.app.route('/process', methods=['POST'])
         def process_command():
             try:
-                data = request.json
+                data = _request_json()
                 device_id = data.get('device_id')
                 message = data.get('message', '').strip()
                 
                 if not device_id or not message:
-                    return jsonify({'error': 'Missing parameters'}), 400
+                    return _json_response({'error': 'Missing parameters'}, 400)
                 
-                # Update device presence
-                if device_id in self.connected_devices:
-                    self.connected_devices[device_id]['last_seen'] = datetime.now()
-                else:
-                    self.connected_devices[device_id] = {
-                        'last_seen': datetime.now(),
-                        'name': 'New Device',
-                        'type': 'android'
-                    }
+                # Update device presence; the view is only republished when a
+                # device is added, known devices get last-seen updated in place
+                with self._devices_lock:
+                    device_info = self.connected_devices.get(device_id)
+                    if device_info is None:
+                        device_info = {
+                            'name': 'New Device',
+                            'type': 'android',
+                            '_flags': self._skill_flags({})
+                        }
+                        device_info['_ai_template'] = self._ai_template(device_id, device_info)
+                        self._touch(device_id, device_info)
+                        self.connected_devices[device_id] = device_info
+                        self._publish_devices()
+                    else:
+                        self._touch(device_id, device_info)
                 
                 logger.info(f"Processing command from {device_id}: {message}")
                 
+                # Repeated phrase: reuse the encoded bridge reply. The reply
+                # embeds the message and, for media, the device's skill count
+                hot_key = (message, device_info['_flags']['media_count'])
+                with self._hot_lock:
+                    body = self._hot_cache.get(hot_key)
+                    if body is not None:
+                        self._hot_cache.move_to_end(hot_key)
+                if body is not None:
+                    return Response(body, mimetype='application/json')
+                
                 # Check if command matches any skill category
                 skill_match = self.match_skill_category(message)
                 if skill_match:
                     response = self.generate_skill_response(skill_match, message, device_id)
-                    return jsonify({
+                    body = fast_json.dumps({
                         'response': response,
                         'skill_used': skill_match,
                         'processed_by': 'bridge',
                         'should_speak': True
                     })
+                    with self._hot_lock:
+                        self._hot_cache[hot_key] = body
+                        if len(self._hot_cache) > self._hot_cache_size:
+                            self._hot_cache.popitem(last=False)
+                    return Response(body, mimetype='application/json')
                 
-                # Send to Crystal AI for complex processing
-                crystal_response = self.send_to_crystal(message, device_id)
-                
-                return jsonify({
-                    'response': crystal_response,
-                    'skill_used': 'ai',
-                    'processed_by': 'crystal_ai',
-                    'should_speak': True
-                })
+                # Send to Crystal AI for complex processing; async callers
+                # get a slow reply handed back as a job instead
+                wants_async = (data.get('async') is True
+                               or 'respond-async' in request.headers.get('Prefer', ''))
+                future = self._ai_pool.submit(self.send_to_crystal, message, device_id)
+                try:
+                    wait = self.ai_wait if wants_async else self.crystal_timeout[1]
+                    return _json_response(self._ai_reply(future.result(timeout=wait)))
+                except FutureTimeout:
+                    if not wants_async:
+                        return _json_response(self._ai_reply(self.fallback_response(message, device_info)))
+                    job_id = self._add_ai_job(future)
+                    return _json_response({
+                        'status': 'pending',
+                        'job_id': job_id,
+                        'poll': f'/result/{job_id}',
+                        'processed_by': 'crystal_ai',
+                        'should_speak': False
+                    }, 202)
                 
             except Exception as e:
                 logger.error(f"Processing error: {e}")
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}, 500)
+        
+        @self.app.route('/result/<job_id>', methods=['GET'])
+        def ai_result(job_id):
+            with self._ai_jobs_lock:
+                future = self._ai_jobs.get(job_id)
+                if future is not None and future.done():
+                    del self._ai_jobs[job_id]
+            if future is None:
+                return _json_response({'error': 'Unknown job'}, 404)
+            if not future.done():
+                return _json_response({'status': 'pending', 'job_id': job_id}, 202)
+            return _json_response(self._ai_reply(future.result()))
         
         @self.app.route('/devices', methods=['GET'])
         def list_devices():
+            # Read the generation before the clock and the device data, so a
+            # reactivation racing this build leaves the body already stale
+            gen = self._devices_gen
+            now = time.monotonic()
+            view = self._devices_view
+            cached = self._devices_cache
+            # Adding or removing a device publishes a new view, and a device
+            # coming back bumps the generation; either invalidates the cached
+            # body. /process updates last-seen in place, so last_seen may lag
+            # by up to the 60s active window
+            if cached is not None and cached[0] is view and cached[1] == gen and now < cached[3]:
+                return Response(cached[2], mimetype='application/json')
+            
             devices = []
-            for device_id, info in self.connected_devices.items():
+            valid_until = float('inf')
+            for device_id, info in view.items():
+                active = now - info['last_seen_mono'] < 60
+                if active:
+                    valid_until = min(valid_until, info['last_seen_mono'] + 60)
                 device_data = {
                     'id': device_id,
                     'name': info.get('name', 'Unknown'),
                     'type': info.get('type', 'unknown'),
-                    'last_seen': info['last_seen'].isoformat(),
+                    'last_seen': info['last_seen_iso'],
                     'ip': info.get('ip', 'unknown'),
                     'skills': info.get('capabilities', {}).get('skills', []),
-                    'status': 'active' if (datetime.now() - info['last_seen']).seconds < 60 else 'inactive'
+                    'status': 'active' if active else 'inactive'
                 }
                 devices.append(device_data)
             
-            return jsonify({
+            body = fast_json.dumps({
                 'devices': devices,
                 'total': len(devices),
                 'active': sum(1 for d in devices if d['status'] == 'active')
             })
+            self._devices_cache = (view, gen, body, valid_until)
+            return Response(body, mimetype='application/json')
         
         @self.app.route('/skills', methods=['GET'])
         def list_skills():
-            return jsonify({
-                'categories': self.skill_categories,
-                'total_categories': len(self.skill_categories),
-                'description': 'Available skill categories for Android devices'
-            })
+            return Response(self._skills_body, mimetype='application/json')
         
         @self.app.route('/execute_skill', methods=['POST'])
         def execute_skill():
             """Direct skill execution endpoint"""
-            data = request.json
+            data = _request_json()
             skill_name = data.get('skill')
             parameters = data.get('parameters', {})
             device_id = data.get('device_id')
             
             if not skill_name:
-                return jsonify({'error': 'Skill name required'}), 400
+                return _json_response({'error': 'Skill name required'}, 400)
             
             response = self.execute_direct_skill(skill_name, parameters, device_id)
-            return jsonify({
+            return _json_response({
                 'skill': skill_name,
                 'result': response,
                 'device_id': device_id
             })
     
+    def _build_keyword_index(self):
+        """Flatten skill_categories into (keyword, category) pairs in match order"""
+        rank = {}
+        for i, keywords in enumerate(self.skill_categories.values()):
+            for keyword in keywords:
+                rank.setdefault(keyword, i)  # first category wins
+        
+        # A keyword containing another keyword of the same or an earlier
+        # category can never decide the match ('unlock' vs 'lock'); drop it
+        categories = list(self.skill_categories)
+        self._keyword_index = tuple(
+            (keyword, categories[r]) for keyword, r in rank.items()
+            if not any(other != keyword and other in keyword and rank[other] <= r for other in rank)
+        )
+    
     def match_skill_category(self, message: str) -> str:
         """Match message to skill category"""
         message_lower = message.lower()
         
-        for category, keywords in self.skill_categories.items():
-            for keyword in keywords:
-                if keyword in message_lower:
-                    return category
+        for keyword, category in self._keyword_index:
+            if keyword in message_lower:
+                return category
         
         return None
     
+    def _skill_flags(self, capabilities: Dict) -> Dict:
+        """Per-device capability summary, computed once at registration"""
+        skills = capabilities.get('skills', [])
+        capabilities_text = str(capabilities).lower()
+        return {
+            'media_count': sum(1 for s in skills if 'music' in s or 'media' in s),
+            'has_music': 'music' in capabilities_text,
+            'has_call': 'call' in capabilities_text
+        }
+    
+    def _ai_template(self, device_id: str, device_info: Dict) -> Dict:
+        """The per-device part of a Crystal AI request, built once per device"""
+        flags = device_info.get('_flags') or self._skill_flags(device_info.get('capabilities', {}))
+        # Static view of the device: no last-seen stamps, no bridge-internal keys
+        public_info = {k: v for k, v in device_info.items()
+                       if not k.startswith(('last_seen', '_'))}
+        return {
+            'device_id': device_id,
+            'device_info': public_info,
+            'device_skills': device_info.get('capabilities', {}).get('skills', []),
+            'context': {
+                'has_media': flags['has_music'],
+                'can_call': flags['has_call'],
+                'device_type': device_info.get('type', 'android')
+            }
+        }
+    
     def generate_skill_response(self, category: str, message: str, device_id: str) -> str:
         """Generate response based on skill category"""
         device_info = self.connected_devices.get(device_id, {})
-        device_skills = device_info.get('capabilities', {}).get('skills', [])
+        flags = device_info.get('_flags') or self._skill_flags({})
         
         responses = {
-            'media': f"I'll handle media control for: '{message}'. Your device has {len([s for s in device_skills if 'music' in s or 'media' in s])} media skills.",
+            'media': f"I'll handle media control for: '{message}'. Your device has {flags['media_count']} media skills.",
             'communication': f"Communication command detected: '{message}'. I can help with calls, messages, and contacts.",
             'device': f"Device control: '{message}'. Adjusting device settings as requested.",
             'apps': f"App control: '{message}'. Launching or managing applications.",
@@ -225,30 +426,33 @@ class SuperCrystalBridge:
         """Send to your Crystal AI"""
         try:
             device_info = self.connected_devices.get(device_id, {})
+            normalized = message.strip().lower()
+            cache_key = (device_id, normalized) if self._ai_cacheable(normalized) else None
+            if cache_key is not None:
+                cached = self._cached_ai_response(cache_key)
+                if cached is not None:
+                    return cached
+            template = device_info.get('_ai_template') or self._ai_template(device_id, device_info)
             
-            ai_request = {
-                'input': message,
-                'device_id': device_id,
-                'device_info': device_info,
-                'device_skills': device_info.get('capabilities', {}).get('skills', []),
-                'context': {
-                    'time': datetime.now().isoformat(),
-                    'has_media': 'music' in str(device_info.get('capabilities', {})).lower(),
-                    'can_call': 'call' in str(device_info.get('capabilities', {})).lower(),
-                    'device_type': device_info.get('type', 'android')
-                }
-            }
+            # Only the message and the time change between requests
+            ai_request = template.copy()
+            ai_request['input'] = message
+            ai_request['context'] = {**template['context'], 'time': datetime.now().isoformat()}
             
             # Send to your Crystal AI
-            response = requests.post(
+            response = self._session.post(
                 f"{self.crystal_endpoint}/chat",
-                json=ai_request,
-                timeout=30
+                data=fast_json.dumps(ai_request),
+                headers={'Content-Type': 'application/json'},
+                timeout=self.crystal_timeout
             )
             
             if response.status_code == 200:
-                ai_data = response.json()
-                return ai_data.get('response', f"Crystal AI: {message}")
+                ai_data = fast_json.loads(response.content)
+                reply = ai_data.get('response', f"Crystal AI: {message}")
+                if cache_key is not None:
+                    self._store_ai_response(cache_key, reply)  # only successful replies
+                return reply
             else:
                 return self.fallback_response(message, device_info)
                 
@@ -256,23 +460,56 @@ class SuperCrystalBridge:
             logger.error(f"Crystal AI connection failed: {e}")
             return self.fallback_response(message, {})
     
+    def _ai_cacheable(self, normalized: str) -> bool:
+        """True if the reply to this message is safe to repeat"""
+        return (len(normalized.split()) >= _AI_CACHE_MIN_WORDS
+                and not _UNCACHEABLE_RE.search(normalized))
+    
+    def _ai_reply(self, reply: str) -> Dict:
+        """/process body for a Crystal AI reply"""
+        return {
+            'response': reply,
+            'skill_used': 'ai',
+            'processed_by': 'crystal_ai',
+            'should_speak': True
+        }
+    
+    def _add_ai_job(self, future) -> str:
+        """Keep a pending Crystal AI call for polling; oldest jobs are dropped"""
+        job_id = uuid.uuid4().hex
+        with self._ai_jobs_lock:
+            self._ai_jobs[job_id] = future
+            while len(self._ai_jobs) > self._ai_jobs_size:
+                self._ai_jobs.popitem(last=False)
+        return job_id
+    
+    def _cached_ai_response(self, key):
+        """Unexpired cached Crystal AI reply for key, or None"""
+        with self._ai_cache_lock:
+            entry = self._ai_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, reply = entry
+            if time.time() - stored_at >= self._ai_cache_ttl:
+                del self._ai_cache[key]
+                return None
+            self._ai_cache.move_to_end(key)
+            return reply
+    
+    def _store_ai_response(self, key, reply):
+        with self._ai_cache_lock:
+            self._ai_cache[key] = (time.time(), reply)
+            self._ai_cache.move_to_end(key)
+            while len(self._ai_cache) > self._ai_cache_size:
+                self._ai_cache.popitem(last=False)
+    
     def fallback_response(self, message: str, device_info: Dict) -> str:
         """Fallback when Crystal AI is unavailable"""
         message_lower = message.lower()
         
-        fallbacks = [
-            ("hello", "Hello! Your Android clone is connected to Crystal Bridge."),
-            ("what can you do", "I can help control your Android device: play music, make calls, send messages, control settings, and much more!"),
-            ("time", f"The time is {datetime.now().strftime('%I:%M %p')}"),
-            ("date", f"Today is {datetime.now().strftime('%A, %B %d, %Y')}"),
-            ("battery", "You can check battery in device settings or ask me to check it for you."),
-            ("weather", "I can fetch weather info through the main Crystal AI when connected."),
-            ("thank", "You're welcome! I'm here to help with your Android device.")
-        ]
-        
-        for keyword, response in fallbacks:
+        for keyword, response in self._FALLBACKS:
             if keyword in message_lower:
-                return response
+                return response() if callable(response) else response
         
         # Check device capabilities
         skills = device_info.get('capabilities', {}).get('skills', [])
@@ -282,25 +519,54 @@ class SuperCrystalBridge:
         
         return f"Android Clone received: '{message}'. Connect to main Crystal AI for full processing."
     
+    def _touch(self, device_id: str, info: Dict):
+        """Mark a device as just seen (moves it to the young end of the order)"""
+        now = time.monotonic()
+        if now - info.get('last_seen_mono', now) >= 60:
+            # Inactive -> active changes /devices output
+            self._devices_gen += 1
+        # Monotonic for liveness checks; ISO string only for /devices output
+        info['last_seen_mono'] = now
+        info['last_seen_iso'] = datetime.now().isoformat()
+        self._last_seen_order[device_id] = now
+        self._last_seen_order.move_to_end(device_id)
+    
+    def _publish_devices(self):
+        """Republish the read-only device view (call with _devices_lock held)"""
+        self._devices_view = MappingProxyType(self.connected_devices.copy())
+    
     def cleanup_devices(self):
         """Remove inactive devices"""
         while True:
             time.sleep(300)  # 5 minutes
-            current_time = datetime.now()
-            expired = []
+            cutoff = time.monotonic() - self.device_timeout
             
-            for device_id, info in self.connected_devices.items():
-                if (current_time - info['last_seen']).seconds > 900:  # 15 minutes
+            expired = []
+            with self._devices_lock:
+                # Oldest first: stop at the first device seen after the cutoff
+                while self._last_seen_order:
+                    device_id, last_seen = next(iter(self._last_seen_order.items()))
+                    if last_seen >= cutoff:
+                        break
+                    self._last_seen_order.popitem(last=False)
+                    self.connected_devices.pop(device_id, None)
                     expired.append(device_id)
+                if expired:
+                    self._publish_devices()
             
             for device_id in expired:
-                del self.connected_devices[device_id]
                 logger.info(f"Removed inactive device: {device_id}")
     
+    def start_background_tasks(self):
+        """Start the device cleanup thread (once per bridge)"""
+        if self._cleanup_started:
+            return
+        self._cleanup_started = True
+        threading.Thread(target=self.cleanup_devices, daemon=True).start()
+    
     def run(self, host='0.0.0.0', port=5000, debug=False):
         """Run the bridge server"""
-        # Start cleanup thread
-        threading.Thread(target=self.cleanup_devices, daemon=True).start()
+        self.start_background_tasks()
         
         # Get local IP for display
         try:
@@ -322,7 +588,24 @@ class SuperCrystalBridge:
         logger.info("=" * 60)
         logger.info("Ready for Android clone connections...")
         
-        self.app.run(host=host, port=port, debug=debug, threaded=True)
+        if WAITRESS_AVAILABLE and not debug:
+            serve(self.app, host=host, port=port, threads=16)
+        else:
+            self.app.run(host=host, port=port, debug=debug, threaded=True)
+
+
+def create_app():
+    """WSGI entry point for an external server (optional, not installed with
+    the bridge; `python super_bridge_server.py` works without one), e.g.
+
+        gunicorn -w 1 -k gthread --threads 16 'super_bridge_server:create_app()'
+        waitress-serve --threads=16 --call super_bridge_server:create_app
+
+    Keep a single worker: connected devices live in this process's memory.
+    """
+    bridge = SuperCrystalBridge()
+    bridge.start_background_tasks()
+    return bridge.app
 
 
 def main():
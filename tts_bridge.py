@@ -1,13 +1,64 @@
 import pyttsx3
+import queue
 import threading
 
 # Global reference to allow interruption
 _current_engine = None
-_engine_lock = threading.Lock()
+_engine = None  # built once by the worker, then reused
+
+# One long-lived worker speaks queued utterances in order
+_tts_queue = queue.Queue()
+
+def _get_engine():
+    """The shared engine with the female voice selected (worker thread only)."""
+    global _engine
+    if _engine is None:
+        engine = pyttsx3.init()
+
+        # Voice setup
+        voices = engine.getProperty("voices")
+        for v in voices:
+            name = v.name.lower()
+            if "zira" in name or "female" in name or "woman" in name:
+                engine.setProperty("voice", v.id)
+                break
+        _engine = engine
+    return _engine
+
+def _tts_worker():
+    global _current_engine, _engine
+    while True:
+        text, emotion = _tts_queue.get()
+        try:
+            engine = _get_engine()
+            _current_engine = engine
+
+            # Emotion-based rate
+            rate = 165
+            if emotion == "happy": rate = 180
+            elif emotion == "sad": rate = 140
+
+            engine.setProperty("rate", rate)
+            engine.setProperty("volume", 0.9)
+
+            engine.say(text)
+            engine.runAndWait()
+            _current_engine = None # Reset after finishing
+        except Exception as e:
+            print("TTS Error:", e)
+            _current_engine = None
+            _engine = None  # rebuild on the next call rather than reuse a broken engine
+
+threading.Thread(target=_tts_worker, daemon=True).start()
 
 def stop_speaking():
     """Immediately terminates any current speech."""
-    global _current_engine
+    # Drop anything still waiting, then cut off the current utterance
+    while True:
+        try:
+            _tts_queue.get_nowait()
+        except queue.Empty:
+            break
     if _current_engine:
         try:
             _current_engine.stop()
@@ -16,36 +67,6 @@ def stop_speaking():
 
 def speak(text: str, emotion: str = None):
     """
-    Threaded TTS that can be interrupted via stop_speaking().
+    Queued TTS that can be interrupted via stop_speaking().
     """
-    def run():
-        global _current_engine
-        try:
-            with _engine_lock:
-                engine = pyttsx3.init()
-                _current_engine = engine 
-                
-                # Voice setup
-                voices = engine.getProperty("voices")
-                for v in voices:
-                    name = v.name.lower()
-                    if "zira" in name or "female" in name or "woman" in name:
-                        engine.setProperty("voice", v.id)
-                        break
-
-                # Emotion-based rate
-                rate = 165
-                if emotion == "happy": rate = 180
-                elif emotion == "sad": rate = 140
-                
-                engine.setProperty("rate", rate)
-                engine.setProperty("volume", 0.9)
-
-                engine.say(text)
-                engine.runAndWait()
-                _current_engine = None # Reset after finishing
-        except Exception as e:
-            print("TTS Error:", e)
-            _current_engine = None
-
-    threading.Thread(target=run, daemon=True).start()
\ No newline at end of file
+    _tts_queue.put((text, emotion))
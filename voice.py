@@ -4,24 +4,20 @@ from voice_state import VoiceState
 from voice_ssml import build_ssml
 from tts_bridge import speak
 import threading
-import hashlib
 
 voice_state = VoiceState()
 _speech_lock = threading.Lock()
-_last_hash = None
+_last_text = None
 
 
 def handle_voice(text):
-    global _last_hash
-
-    # Create a stable fingerprint of the response
-    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    global _last_text
 
     with _speech_lock:
         # HARD STOP: never speak the same response twice
-        if _last_hash == text_hash:
+        if _last_text == text:
             return
-        _last_hash = text_hash
+        _last_text = text
 
     ssml = build_ssml(text, voice_state)
     speak(ssml)
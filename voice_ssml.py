@@ -1,23 +1,36 @@
 # voice_ssml.py
 
+import re
+from functools import lru_cache
+
+# (rate, base pitch in percent, opening pause)
 VOICE_PROFILES = {
-    "gentle": ("medium", "+2%", "300ms"),
-    "playful": ("fast", "+8%", "150ms"),
-    "cold": ("slow", "-6%", "400ms"),
-    "protective": ("medium", "-2%", "250ms"),
+    "gentle": ("medium", 2, "300ms"),
+    "playful": ("fast", 8, "150ms"),
+    "cold": ("slow", -6, "400ms"),
+    "protective": ("medium", -2, "250ms"),
+}
+
+# Pause markup per punctuation
+_BREAKS = {
+    "...": "<break time='500ms'/>",
+    ",": ",<break time='120ms'/>",
+    ".": ".<break time='220ms'/>",
 }
+_BREAK_RE = re.compile(r"\.\.\.|[,.]")  # "..." first so it wins over "."
 
 def humanize(text):
-    return (
-        text.replace("...", "<break time='500ms'/>")
-            .replace(",", ",<break time='120ms'/>")
-            .replace(".", ".<break time='220ms'/>")
-    )
+    return _BREAK_RE.sub(lambda m: _BREAKS[m.group(0)], text)
 
 def build_ssml(text, state):
-    rate, pitch, pause = VOICE_PROFILES[state.personality]
-    intimacy_boost = int(state.intimacy * 5)
-    final_pitch = f"+{int(pitch.replace('%','')) + intimacy_boost}%"
+    # Intimacy only matters through its whole-number pitch boost, so states
+    # that differ below that share a cache entry
+    return _build_ssml_cached(text, state.personality, int(state.intimacy * 5))
+
+@lru_cache(maxsize=1024)
+def _build_ssml_cached(text, personality, intimacy_boost):
+    rate, pitch, pause = VOICE_PROFILES[personality]
+    final_pitch = f"{pitch + intimacy_boost:+d}%"
 
     return f"""
 <speak>
@@ -3,6 +3,8 @@
 import json
 import os
 
+from core import fast_json
+
 class VoiceState:
     def __init__(self, path="voice_state.json"):
         self.path = path
@@ -10,13 +12,27 @@ class VoiceState:
         self.intimacy = 0.3
         self.trust = 0.5
         self.personality = "gentle"
+        self._saved = None  # bytes last written, to skip unchanged saves
         self.load()
 
     def load(self):
         if os.path.exists(self.path):
             with open(self.path, "r") as f:
                 self.__dict__.update(json.load(f))
+            # What's on disk now matches memory, so an unchanged save is skipped
+            self._saved = self._encode()
+
+    def _encode(self):
+        state = {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
+        return fast_json.dumps(state)
 
     def save(self):
-        with open(self.path, "w") as f:
-            json.dump(self.__dict__, f, indent=2)
+        data = self._encode()
+        if data == self._saved:
+            return
+        # Write then rename so a crash mid-write never leaves a truncated file
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+        self._saved = data